@@ -1,11 +1,14 @@
 """
 Script principal unificado para extraer metadatos de diferentes vendors (PostgreSQL, Oracle, SQL Server).
 Uso: python main.py --vendor [postgres|oracle|mssql]
+     python main.py --targets config-batch.yaml
 """
 import yaml
 import os
 import sys
 import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from collections import defaultdict
 from jinja2 import Environment, FileSystemLoader
@@ -19,6 +22,8 @@ from logger_config import (
     log_script_completion, log_script_error
 )
 from services import PostgresMetadataService, OracleMetadataService, MSSQLMetadataService
+from snapshot_cache import SnapshotCache, safe_name, marker_map, changed_categories
+from row_spool import RowSpool
 
 # Mapeo de vendors a sus servicios y configuraciones
 VENDOR_CONFIG = {
@@ -49,17 +54,47 @@ Ejemplos de uso:
   python main.py --vendor postgres
   python main.py --vendor oracle
   python main.py --vendor mssql
+  python main.py --vendor oracle --workers 4
+  python main.py --vendor postgres --cache ./output/.cache
+  python main.py --targets config-batch.yaml
         """
     )
     
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
         '--vendor',
         '-v',
         type=str,
-        required=True,
         choices=['postgres', 'oracle', 'mssql'],
         help='Tipo de base de datos (postgres, oracle, mssql)'
     )
+    mode.add_argument(
+        '--targets',
+        '-t',
+        type=str,
+        help='Archivo YAML con los destinos (vendor, conexión, schemas) a documentar por lotes'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        '-w',
+        type=int,
+        default=1,
+        help='Conexiones concurrentes para ejecutar las consultas de catálogo (default: 1, secuencial)'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        type=str,
+        help='Directorio de snapshots: solo se vuelven a consultar las categorías con cambios'
+    )
+    
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignorar el snapshot en caché y hacer una extracción completa '
+             '(requiere --cache, o batch.cache con --targets)'
+    )
     
     return parser.parse_args()
 
@@ -75,13 +110,35 @@ def load_config(config_file: str, logger) -> dict:
         logger.error(f"❌ Error al leer archivo de configuración: {e}")
         sys.exit(1)
 
+def group_by_table(rows: list, column: str = 'table_name') -> dict:
+    """Agrupar filas (diccionarios o namedtuples) por la columna con el nombre de tabla"""
+    grouped = defaultdict(list)
+    for row in rows:
+        table_name = row[column] if isinstance(row, dict) else getattr(row, column)
+        grouped[table_name].append(row)
+    return dict(grouped)
+
 def organize_table_metadata(table_data: list) -> dict:
     """Organizar metadatos de tablas por nombre de tabla"""
-    organized = defaultdict(list)
-    for row in table_data:
-        table_name = row['table_name']
-        organized[table_name].append(row)
-    return dict(organized)
+    return group_by_table(table_data)
+
+def index_table_objects(metadata: dict) -> dict:
+    """
+    Índices por tabla de índices, claves foráneas y triggers, para que el
+    template recorra solo los objetos de cada tabla en lugar de la lista
+    completa una vez por tabla (table_row_count ya es un diccionario por tabla).
+    Los triggers se agrupan sin su definición, que el template no muestra,
+    para no cargar en memoria los textos leídos en streaming.
+    """
+    trigger_summaries = (
+        {column: value for column, value in trigger.items() if column != 'trigger_definition'}
+        for trigger in metadata['trigger_definitions']
+    )
+    return {
+        'indexes_by_table': group_by_table(metadata['database_indexes']),
+        'foreign_keys_by_table': group_by_table(metadata['foreign_key_metadata'], 'table_from'),
+        'triggers_by_table': group_by_table(trigger_summaries),
+    }
 
 def generate_documentation(metadata: dict, template_path: str, output_file: str, logger):
     """Generar documentación usando template Jinja2"""
@@ -95,13 +152,14 @@ def generate_documentation(metadata: dict, template_path: str, output_file: str,
         env = Environment(loader=FileSystemLoader(template_dir))
         template = env.get_template(template_file)
         
-        # Renderizar template
-        rendered = template.render(metadata=metadata)
-        
-        # Escribir archivo de salida
+        # Renderizar el template por partes directo al archivo, sin armar el
+        # documento completo en memoria (las definiciones se leen de disco)
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(rendered)
+        tmp_file = f"{output_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for chunk in template.generate(metadata=metadata):
+                f.write(chunk)
+        os.replace(tmp_file, output_file)
         
         logger.info(f"✅ Documentación generada exitosamente: {output_file}")
         
@@ -109,64 +167,277 @@ def generate_documentation(metadata: dict, template_path: str, output_file: str,
         logger.error(f"❌ Error al generar documentación: {e}")
         raise
 
-def extract_metadata(metadata_service, logger) -> dict:
-    """Extraer todos los metadatos usando el servicio proporcionado"""
+# Consultas de extracción: clave en el dict de metadatos → (método del
+# servicio, descripción para el log)
+METADATA_QUERIES = {
+    'database_info': ('get_database_info', "📊 Información de la base de datos"),
+    'table_metadata': ('get_table_metadata', "🗂️ Metadatos de tablas"),
+    'database_indexes': ('get_database_indexes', "📇 Índices"),
+    'foreign_key_metadata': ('get_foreign_key_metadata', "🔗 Claves foráneas"),
+    'function_definitions': ('get_function_definitions', "⚙️ Definiciones de funciones"),
+    'view_definitions': ('get_view_definitions', "👁️ Definiciones de vistas"),
+    'trigger_definitions': ('get_trigger_definitions', "⚡ Definiciones de triggers"),
+    'table_row_count': ('get_table_row_count', "🔢 Conteos de filas"),
+}
+
+# Consultas cuyo método retorna un iterador (stream_query): sus filas se
+# vuelcan a disco con RowSpool en lugar de acumularse en memoria
+STREAMED_QUERIES = {'function_definitions', 'view_definitions', 'trigger_definitions'}
+
+def run_query(metadata_service, key: str, logger):
+    """
+    Ejecutar una consulta de METADATA_QUERIES registrando su duración.
+    Retorna (resultado, si la consulta falló).
+    """
+    method, description = METADATA_QUERIES[key]
+    logger.info(f"{description}: extrayendo...")
+    start = time.perf_counter()
+    with metadata_service.track_failures() as failures:
+        result = getattr(metadata_service, method)()
+        if key in STREAMED_QUERIES:
+            result = RowSpool(result)
+    logger.info(f"⏱️ {description}: {time.perf_counter() - start:.2f}s")
+    return result, bool(failures)
+
+def extract_metadata(metadata_service, logger, workers: int = 1, cache=None) -> dict:
+    """
+    Extraer todos los metadatos usando el servicio proporcionado.
+    Con workers > 1 las consultas se ejecutan en paralelo en un pool de
+    hilos, cada una con su propia conexión del pool del servicio.
+    Con cache (SnapshotCache) solo se vuelven a consultar las categorías
+    cuyos objetos cambiaron desde el último snapshot; el resto se toma de él.
+    Las categorías cuya consulta falló no se guardan en el snapshot, para
+    volver a consultarlas en la siguiente ejecución.
+    """
     metadata = {
         'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'database_info': {},
-        'table_metadata': {},
-        'database_indexes': [],
-        'foreign_key_metadata': [],
-        'function_definitions': [],
-        'view_definitions': [],
-        'trigger_definitions': [],
-        'table_row_count': {}
     }
     
-    # Extraer información de la base de datos
-    logger.info("📊 Extrayendo información de la base de datos...")
-    metadata['database_info'] = metadata_service.get_database_info()
-    logger.info(f"✅ Información de BD extraída: {metadata['database_info']['vendor']}")
+    keys = list(METADATA_QUERIES)
+    snapshot = None
+    if cache is not None:
+        start = time.perf_counter()
+        with metadata_service.track_failures() as marker_failures:
+            markers = marker_map(metadata_service.get_change_markers())
+        logger.info(f"⏱️ 🔍 Marcadores de cambio: {time.perf_counter() - start:.2f}s")
+        snapshot = cache.load()
+        if snapshot is None:
+            logger.info(f"💾 Sin snapshot previo, extracción completa: {cache.path}")
+        else:
+            changed = changed_categories(snapshot['markers'], markers)
+            keys = [key for key in METADATA_QUERIES
+                    if key == 'database_info' or key in changed or key not in snapshot['results']]
+            logger.info(f"💾 Snapshot en caché: {len(keys) - 1} de {len(METADATA_QUERIES) - 1} "
+                        f"categorías con cambios")
+    
+    if workers > 1 and len(keys) > 1:
+        workers = min(workers, len(keys))
+        logger.info(f"🧵 Extracción concurrente con {workers} conexiones")
+        metadata_service.open_pool(workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(run_query, metadata_service, key, logger)
+                for key in keys
+            }
+            outcomes = {key: future.result() for key, future in futures.items()}
+    else:
+        outcomes = {key: run_query(metadata_service, key, logger) for key in keys}
+    results = {key: result for key, (result, _) in outcomes.items()}
+    failed = [key for key, (_, has_failed) in outcomes.items() if has_failed]
+    if failed:
+        logger.warning(f"⚠️ Consultas con errores (resultado vacío): {', '.join(failed)}")
+    
+    if cache is not None:
+        if snapshot is not None:
+            results = {**snapshot['results'], **results}
+        if marker_failures:
+            logger.warning("⚠️ No se pudieron leer los marcadores de cambio; no se guarda el snapshot")
+        else:
+            cache.save(markers, {key: value for key, value in results.items() if key not in failed})
     
-    # Extraer metadatos de tablas
-    logger.info("🗂️ Extrayendo metadatos de tablas...")
-    table_data = metadata_service.get_table_metadata()
-    metadata['table_metadata'] = organize_table_metadata(table_data)
+    metadata['database_info'] = results['database_info']
+    logger.info(f"✅ Información de BD extraída: {metadata['database_info'].get('vendor', 'Unknown')}")
+    
+    metadata['table_metadata'] = organize_table_metadata(results['table_metadata'])
     logger.info(f"✅ Metadatos de {len(metadata['table_metadata'])} tablas extraídos")
     
-    # Extraer índices
-    logger.info("📇 Extrayendo información de índices...")
-    metadata['database_indexes'] = metadata_service.get_database_indexes()
+    metadata['database_indexes'] = results['database_indexes']
     logger.info(f"✅ {len(metadata['database_indexes'])} índices extraídos")
     
-    # Extraer claves foráneas
-    logger.info("🔗 Extrayendo claves foráneas...")
-    metadata['foreign_key_metadata'] = metadata_service.get_foreign_key_metadata()
+    metadata['foreign_key_metadata'] = results['foreign_key_metadata']
     logger.info(f"✅ {len(metadata['foreign_key_metadata'])} claves foráneas extraídas")
     
-    # Extraer funciones
-    logger.info("⚙️ Extrayendo definiciones de funciones...")
-    metadata['function_definitions'] = metadata_service.get_function_definitions()
+    metadata['function_definitions'] = results['function_definitions']
     logger.info(f"✅ {len(metadata['function_definitions'])} funciones extraídas")
     
-    # Extraer vistas
-    logger.info("👁️ Extrayendo definiciones de vistas...")
-    metadata['view_definitions'] = metadata_service.get_view_definitions()
+    metadata['view_definitions'] = results['view_definitions']
     logger.info(f"✅ {len(metadata['view_definitions'])} vistas extraídas")
     
-    # Extraer triggers
-    logger.info("⚡ Extrayendo definiciones de triggers...")
-    metadata['trigger_definitions'] = metadata_service.get_trigger_definitions()
+    metadata['trigger_definitions'] = results['trigger_definitions']
     logger.info(f"✅ {len(metadata['trigger_definitions'])} triggers extraídos")
     
-    # Extraer conteos de filas
-    logger.info("🔢 Extrayendo conteos de filas...")
-    row_counts = metadata_service.get_table_row_count()
-    metadata['table_row_count'] = {row['table_name']: row['estimated_rows'] for row in row_counts}
+    metadata['table_row_count'] = {row['table_name']: row['estimated_rows'] for row in results['table_row_count']}
     logger.info(f"✅ Conteos de {len(metadata['table_row_count'])} tablas extraídos")
     
+    metadata.update(index_table_objects(metadata))
+    
     return metadata
 
+def target_server(vendor: str, db_config: dict) -> str:
+    """Identificador del servidor de un destino, para limitar sus conexiones"""
+    return f"{vendor}://{db_config.get('host', 'N/A')}:{db_config.get('port', 'N/A')}"
+
+def target_database(db_config: dict) -> str:
+    """Nombre de la base de datos (o service name en Oracle) de un destino"""
+    return db_config.get('database', db_config.get('service_name', 'N/A'))
+
+def build_jobs(batch_config: dict, refresh: bool = False) -> list:
+    """
+    Expandir los destinos del archivo de lotes en un trabajo por schema;
+    con refresh se ignoran los snapshots en caché (batch.cache)
+    """
+    output = batch_config.get('output', {})
+    template = output.get('template', './templates/SCHEMA_TEMPLATE.md')
+    directory = output.get('directory', './output/batch')
+    jobs = []
+    for target in batch_config.get('targets', []):
+        vendor = target['vendor']
+        if vendor not in VENDOR_CONFIG:
+            raise ValueError(f"Vendor no soportado en destino: {vendor}")
+        db_config = target['database']
+        for schema in target['schemas']:
+            name = safe_name(vendor, db_config.get('host', ''), db_config.get('port', ''),
+                             target_database(db_config), schema)
+            jobs.append({
+                'vendor': vendor,
+                'server': target_server(vendor, db_config),
+                'schema': schema,
+                'database': {**db_config, 'schema': schema},
+                'template': template,
+                'file': os.path.join(directory, f"{name}.md"),
+                'cache': batch_config.get('batch', {}).get('cache'),
+                'refresh': refresh,
+            })
+    return jobs
+
+def extract_target(job: dict) -> dict:
+    """
+    Extraer y documentar un schema; se ejecuta en un proceso worker con su
+    propia conexión. Los errores se retornan en el resultado para que un
+    destino caído no detenga el resto del lote.
+    """
+    vendor_info = VENDOR_CONFIG[job['vendor']]
+    logger = setup_logger(f"{job['vendor']}_{job['schema']}_metadata")
+    result = {
+        'vendor': vendor_info['display_name'],
+        'server': job['server'],
+        'database': target_database(job['database']),
+        'schema': job['schema'],
+        'file': job['file'],
+        'error': None,
+    }
+    start = time.perf_counter()
+    metadata_service = None
+    try:
+        metadata_service = vendor_info['service_class'](job['database'])
+        cache = None
+        if job['cache']:
+            cache = SnapshotCache(job['cache'], job['vendor'], job['database'], job['refresh'])
+        metadata = extract_metadata(metadata_service, logger, cache=cache)
+        generate_documentation(metadata, job['template'], job['file'], logger)
+        result.update({
+            'tables': len(metadata['table_metadata']),
+            'views': len(metadata['view_definitions']),
+            'functions': len(metadata['function_definitions']),
+        })
+    except Exception as e:
+        logger.error(f"❌ Error documentando {job['server']} {job['schema']}: {e}")
+        result['error'] = str(e)
+    finally:
+        if metadata_service is not None:
+            metadata_service.close()
+    result['duration'] = time.perf_counter() - start
+    return result
+
+def run_batch(jobs: list, workers: int, max_connections: int, logger) -> list:
+    """
+    Ejecutar los trabajos en un pool de procesos. Un trabajo solo se envía
+    cuando su servidor tiene menos de max_connections extracciones en curso,
+    de modo que ningún servidor recibe más conexiones simultáneas que esas.
+    """
+    pending = list(jobs)
+    running = {}
+    active = defaultdict(int)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for job in list(pending):
+                if len(running) >= workers:
+                    break
+                if active[job['server']] < max_connections:
+                    pending.remove(job)
+                    active[job['server']] += 1
+                    running[executor.submit(extract_target, job)] = job
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = running.pop(future)
+                active[job['server']] -= 1
+                result = future.result()
+                results.append(result)
+                status = f"❌ {result['error']}" if result['error'] else f"✅ {result['file']}"
+                logger.info(f"[{len(results)}/{len(jobs)}] {job['server']} {job['schema']} "
+                            f"({result['duration']:.2f}s): {status}")
+    return sorted(results, key=lambda r: (r['server'], r['database'], r['schema']))
+
+def main_batch(targets_file: str, refresh: bool = False):
+    """Modo por lotes: un documento por schema más un índice agregado"""
+    logger = setup_logger('batch_metadata')
+    logger.info(f"🚀 Iniciando extracción de metadatos por lotes: {targets_file}")
+    start_time = datetime.now()
+    
+    try:
+        batch_config = load_config(targets_file, logger)
+        settings = batch_config.get('batch', {})
+        workers = settings.get('workers', 4)
+        max_connections = settings.get('max_connections_per_server', 2)
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError(f"batch.workers debe ser un entero >= 1: {workers!r}")
+        if not isinstance(max_connections, int) or max_connections < 1:
+            raise ValueError(f"batch.max_connections_per_server debe ser un entero >= 1: {max_connections!r}")
+        if refresh and not settings.get('cache'):
+            raise ValueError("--refresh requiere batch.cache en el archivo de destinos")
+        jobs = build_jobs(batch_config, refresh)
+        logger.info(f"📋 {len(jobs)} schemas en {len({job['server'] for job in jobs})} servidores "
+                    f"({workers} procesos, máx. {max_connections} conexiones por servidor)")
+        
+        results = run_batch(jobs, workers, max_connections, logger)
+        
+        output = batch_config.get('output', {})
+        index_file = output.get('index', os.path.join(output.get('directory', './output/batch'), 'index.md'))
+        index_dir = os.path.dirname(os.path.abspath(index_file))
+        for result in results:
+            result['link'] = os.path.relpath(os.path.abspath(result['file']), index_dir)
+        index = {
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'documents': results,
+        }
+        generate_documentation(index, output.get('index_template', './templates/INDEX_TEMPLATE.md'),
+                               index_file, logger)
+        
+        failed = [result for result in results if result['error']]
+        duration = (datetime.now() - start_time).total_seconds()
+        logger.info("🎉 EXTRACCIÓN POR LOTES COMPLETADA")
+        logger.info(f"   • Schemas documentados: {len(results) - len(failed)}/{len(results)}")
+        logger.info(f"📄 Índice generado: {index_file}")
+        log_script_completion(logger, duration)
+        if failed:
+            logger.error(f"❌ {len(failed)} schemas con errores")
+            sys.exit(1)
+    
+    except Exception as e:
+        log_script_error(logger, e)
+        sys.exit(1)
+
 def print_statistics(metadata: dict, output_file: str, duration: float, logger):
     """Imprimir estadísticas finales"""
     logger.info("🎉 EXTRACCIÓN DE METADATOS COMPLETADA")
@@ -184,6 +455,9 @@ def main():
     """Función principal"""
     # Parsear argumentos
     args = parse_arguments()
+    if args.targets:
+        main_batch(args.targets, args.refresh)
+        return
     vendor = args.vendor
     
     # Validar vendor y obtener configuración
@@ -192,6 +466,14 @@ def main():
         print(f"Vendors disponibles: {', '.join(VENDOR_CONFIG.keys())}")
         sys.exit(1)
     
+    if args.refresh and not args.cache:
+        print("❌ --refresh requiere --cache")
+        sys.exit(1)
+    
+    if args.workers < 1:
+        print(f"❌ --workers debe ser al menos 1: {args.workers}")
+        sys.exit(1)
+    
     vendor_info = VENDOR_CONFIG[vendor]
     display_name = vendor_info['display_name']
     
@@ -219,7 +501,10 @@ def main():
         log_connection_success(logger, display_name)
         
         # Extraer metadatos
-        metadata = extract_metadata(metadata_service, logger)
+        cache = None
+        if args.cache:
+            cache = SnapshotCache(args.cache, vendor, config['database'], args.refresh)
+        metadata = extract_metadata(metadata_service, logger, args.workers, cache)
         
         # Generar documentación
         template_path = config['output']['template']
@@ -0,0 +1,52 @@
+"""
+Almacenamiento en disco de las filas leídas en streaming.
+
+Las definiciones de funciones, vistas y triggers pueden ser textos muy
+grandes: en lugar de acumularlas en una lista se vuelcan fila a fila a un
+archivo temporal (un JSON por línea) y se vuelven a leer del disco cada vez
+que se recorren (template, snapshot), con una sola fila en memoria a la vez.
+"""
+import json
+import os
+import tempfile
+import weakref
+
+
+def plain_row(row):
+    """Convertir una fila namedtuple (stream_query) en diccionario serializable"""
+    return row._asdict() if hasattr(row, '_asdict') else row
+
+
+class RowSpool:
+    """Filas en un archivo temporal; admite len(), bool() y varios recorridos"""
+
+    def __init__(self, rows=()):
+        descriptor, self.path = tempfile.mkstemp(prefix='metadata-', suffix='.jsonl')
+        self._file = os.fdopen(descriptor, 'w', encoding='utf-8')
+        self._count = 0
+        self._finalizer = weakref.finalize(self, RowSpool._remove, self._file, self.path)
+        for row in rows:
+            self.append(row)
+
+    @staticmethod
+    def _remove(file, path):
+        file.close()
+        if os.path.exists(path):
+            os.remove(path)
+
+    def append(self, row):
+        self._file.write(json.dumps(plain_row(row), default=str) + '\n')
+        self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        self._file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def close(self):
+        """Borrar el archivo temporal (también se borra al liberar el objeto)"""
+        self._finalizer()
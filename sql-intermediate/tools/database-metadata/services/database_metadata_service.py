@@ -3,16 +3,77 @@ Servicio base para extracción de metadatos de bases de datos.
 Define la interfaz común para todos los proveedores de base de datos.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Dict, Any, List, Iterator
 import logging
+import queue
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Filas por round-trip de fetchmany en las consultas en streaming
+DEFAULT_ARRAYSIZE = 500
+
 class DatabaseMetadataService(ABC):
     """Clase base abstracta para servicios de extracción de metadatos"""
     
-    def __init__(self, connection):
+    def __init__(self, connection, arraysize: int = DEFAULT_ARRAYSIZE):
         self.connection = connection
+        self.arraysize = arraysize
+        self._pool = None
+        self._failures = threading.local()
+    
+    @abstractmethod
+    def _create_connection(self):
+        """Crea una nueva conexión con la configuración del servicio"""
+        pass
+    
+    def open_pool(self, size: int):
+        """
+        Abre un pool de size conexiones (la conexión principal más size - 1
+        nuevas) para que varias consultas puedan ejecutarse en paralelo desde
+        distintos hilos; cada consulta toma una conexión libre del pool.
+        
+        Args:
+            size (int): Número total de conexiones del pool
+        """
+        pool = queue.Queue()
+        pool.put(self.connection)
+        for _ in range(size - 1):
+            pool.put(self._create_connection())
+        self._pool = pool
+    
+    @contextmanager
+    def track_failures(self):
+        """
+        Registra en una lista los nombres de las consultas que fallen dentro
+        del bloque en el hilo actual (las consultas registran el error y
+        retornan vacío, por lo que el resultado por sí solo no lo distingue).
+        """
+        self._failures.names = []
+        try:
+            yield self._failures.names
+        finally:
+            self._failures.names = None
+    
+    def _record_failure(self, query_name: str):
+        """Anota una consulta fallida si el hilo actual está dentro de track_failures"""
+        names = getattr(self._failures, 'names', None)
+        if names is not None:
+            names.append(query_name)
+    
+    @contextmanager
+    def _acquire(self):
+        """Presta una conexión del pool, o la conexión principal si no hay pool"""
+        if self._pool is None:
+            yield self.connection
+            return
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
     
     @abstractmethod
     def get_database_indexes_query(self) -> str:
@@ -49,6 +110,16 @@ class DatabaseMetadataService(ABC):
         """Retorna la consulta SQL para obtener definiciones de triggers"""
         pass
     
+    @abstractmethod
+    def get_change_markers_query(self) -> str:
+        """
+        Retorna la consulta SQL de detección de cambios: una fila por objeto
+        (object_type, object_name, marker), donde marker cambia cuando el
+        objeto se modifica. object_type es table, view, index, constraint,
+        trigger, function o rows (conteo estimado de filas de una tabla).
+        """
+        pass
+    
     @abstractmethod
     def _get_specific_vendor_metadata(self, cursor) -> Dict[str, Any]:
         """Obtiene metadatos específicos del proveedor de base de datos"""
@@ -66,7 +137,7 @@ class DatabaseMetadataService(ABC):
             List[Dict[str, Any]]: Lista de diccionarios con los resultados
         """
         try:
-            with self.connection.cursor() as cursor:
+            with self._acquire() as connection, connection.cursor() as cursor:
                 cursor.execute(query)
                 columns = [desc[0] for desc in cursor.description]
                 results = []
@@ -78,8 +149,55 @@ class DatabaseMetadataService(ABC):
                 
         except Exception as e:
             logger.error(f"Error executing query {query_name}: {e}")
+            self._record_failure(query_name)
             return []
     
+    @contextmanager
+    def _server_cursor(self, connection, query_name: str):
+        """
+        Cursor que recorre el resultado en el servidor por bloques. Los cursores
+        de oracledb y pyodbc ya lo hacen; los vendors que lo requieran (cursores
+        con nombre de PostgreSQL) sobrescriben este método.
+        """
+        with connection.cursor() as cursor:
+            yield cursor
+    
+    def stream_query(self, query: str, query_name: str, arraysize: int = None) -> Iterator[tuple]:
+        """
+        Ejecuta una consulta con un cursor del lado del servidor y retorna sus
+        filas una a una, leyéndolas con fetchmany de arraysize en arraysize.
+        Cada fila es una namedtuple (sin __dict__) en lugar de un diccionario,
+        por lo que solo el bloque actual vive en memoria del cliente.
+        
+        Args:
+            query (str): Consulta SQL a ejecutar
+            query_name (str): Nombre descriptivo de la consulta para logging
+            arraysize (int): Filas por round-trip (default: self.arraysize)
+            
+        Yields:
+            tuple: Filas del resultado con acceso por nombre de columna
+        """
+        arraysize = arraysize or self.arraysize
+        try:
+            with self._acquire() as connection, self._server_cursor(connection, query_name) as cursor:
+                cursor.arraysize = arraysize
+                cursor.execute(query)
+                row_type = namedtuple('Row', [desc[0] for desc in cursor.description], rename=True)
+                count = 0
+                while True:
+                    rows = cursor.fetchmany(arraysize)
+                    if not rows:
+                        break
+                    count += len(rows)
+                    for row in rows:
+                        yield row_type._make(row)
+                
+                logger.debug(f"Query {query_name} streamed successfully, {count} rows returned")
+                
+        except Exception as e:
+            logger.error(f"Error streaming query {query_name}: {e}")
+            self._record_failure(query_name)
+    
     def extract_all_metadata(self) -> Dict[str, Any]:
         """
         Extrae todos los metadatos de la base de datos.
@@ -164,10 +282,11 @@ class DatabaseMetadataService(ABC):
     def get_database_info(self) -> Dict[str, Any]:
         """Obtiene información general de la base de datos"""
         try:
-            with self.connection.cursor() as cursor:
+            with self._acquire() as connection, connection.cursor() as cursor:
                 return self._get_specific_vendor_metadata(cursor)
         except Exception as e:
             logger.error(f"Error getting database info: {e}")
+            self._record_failure("Database Info")
             return {}
     
     def get_table_metadata(self) -> List[Dict[str, Any]]:
@@ -182,25 +301,35 @@ class DatabaseMetadataService(ABC):
         """Obtiene metadatos de claves foráneas"""
         return self.execute_query(self.get_foreign_key_metadata_query(), "Foreign Keys")
     
-    def get_function_definitions(self) -> List[Dict[str, Any]]:
-        """Obtiene definiciones de funciones"""
-        return self.execute_query(self.get_function_definitions_query(), "Function Definitions")
+    def get_function_definitions(self) -> Iterator[tuple]:
+        """Itera las definiciones de funciones en streaming (pueden ser textos muy grandes)"""
+        return self.stream_query(self.get_function_definitions_query(), "Function Definitions")
     
-    def get_view_definitions(self) -> List[Dict[str, Any]]:
-        """Obtiene definiciones de vistas"""
-        return self.execute_query(self.get_view_definitions_query(), "View Definitions")
+    def get_view_definitions(self) -> Iterator[tuple]:
+        """Itera las definiciones de vistas en streaming"""
+        return self.stream_query(self.get_view_definitions_query(), "View Definitions")
     
-    def get_trigger_definitions(self) -> List[Dict[str, Any]]:
-        """Obtiene definiciones de triggers"""
-        return self.execute_query(self.get_trigger_definitions_query(), "Trigger Definitions")
+    def get_trigger_definitions(self) -> Iterator[tuple]:
+        """Itera las definiciones de triggers en streaming"""
+        return self.stream_query(self.get_trigger_definitions_query(), "Trigger Definitions")
     
     def get_table_row_count(self) -> List[Dict[str, Any]]:
         """Obtiene conteos de filas de las tablas"""
         return self.execute_query(self.get_table_row_count_query(), "Table Row Counts")
     
+    def get_change_markers(self) -> List[Dict[str, Any]]:
+        """Obtiene los marcadores de cambio de los objetos del schema"""
+        return self.execute_query(self.get_change_markers_query(), "Change Markers")
+    
     def close(self):
-        """Cierra la conexión a la base de datos"""
+        """Cierra la conexión a la base de datos y las del pool, si existe"""
         try:
+            if self._pool is not None:
+                while not self._pool.empty():
+                    connection = self._pool.get_nowait()
+                    if connection is not self.connection:
+                        connection.close()
+                self._pool = None
             if hasattr(self, 'connection') and self.connection:
                 self.connection.close()
                 logger.info("Database connection closed")
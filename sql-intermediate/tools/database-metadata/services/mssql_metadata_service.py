@@ -5,7 +5,7 @@ Implementa todas las consultas específicas para SQL Server.
 import pyodbc
 import logging
 from typing import Dict, Any
-from .database_metadata_service import DatabaseMetadataService
+from .database_metadata_service import DatabaseMetadataService, DEFAULT_ARRAYSIZE
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ class MSSQLMetadataService(DatabaseMetadataService):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.connection = self._create_connection()
-        super().__init__(self.connection)
+        super().__init__(self.connection, self.config.get('arraysize', DEFAULT_ARRAYSIZE))
     
     def _create_connection(self):
         """Crear conexión a SQL Server"""
@@ -158,6 +158,43 @@ class MSSQLMetadataService(DatabaseMetadataService):
         ORDER BY table_name, trigger_name
         """
     
+    def get_change_markers_query(self) -> str:
+        """
+        Retorna la consulta de detección de cambios de SQL Server: modify_date
+        de sys.objects, la definición básica de cada índice y las filas de
+        sys.partitions
+        """
+        schema = self.config.get('schema', 'dbo')
+        return f"""
+        SELECT
+          CASE o.type
+            WHEN 'U' THEN 'table'
+            WHEN 'V' THEN 'view'
+            WHEN 'TR' THEN 'trigger'
+            WHEN 'F' THEN 'constraint'
+            ELSE 'function'
+          END AS object_type,
+          o.name AS object_name,
+          CONVERT(varchar(30), o.modify_date, 126) AS marker
+        FROM sys.objects o
+        JOIN sys.schemas s ON o.schema_id = s.schema_id
+        WHERE s.name = '{schema}'
+          AND o.type IN ('U', 'V', 'TR', 'F', 'P', 'FN', 'IF', 'TF', 'FS', 'FT', 'PC')
+        UNION ALL
+        SELECT 'index', t.name + '.' + i.name, CONCAT(i.index_id, ':', i.type_desc, ':', i.is_unique)
+        FROM sys.indexes i
+        JOIN sys.tables t ON i.object_id = t.object_id
+        JOIN sys.schemas s ON t.schema_id = s.schema_id
+        WHERE s.name = '{schema}' AND i.name IS NOT NULL
+        UNION ALL
+        SELECT 'rows', t.name, CAST(SUM(p.rows) AS varchar(30))
+        FROM sys.tables t
+        JOIN sys.schemas s ON t.schema_id = s.schema_id
+        JOIN sys.partitions p ON t.object_id = p.object_id
+        WHERE s.name = '{schema}' AND p.index_id IN (0, 1)
+        GROUP BY t.name
+        """
+    
     def _get_specific_vendor_metadata(self, cursor) -> Dict[str, Any]:
         """Obtiene metadatos específicos de SQL Server"""
         try:
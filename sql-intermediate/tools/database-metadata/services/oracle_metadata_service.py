@@ -5,7 +5,7 @@ Implementa todas las consultas específicas para Oracle.
 import oracledb
 import logging
 from typing import Dict, Any
-from .database_metadata_service import DatabaseMetadataService
+from .database_metadata_service import DatabaseMetadataService, DEFAULT_ARRAYSIZE
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ class OracleMetadataService(DatabaseMetadataService):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.connection = self._create_connection()
-        super().__init__(self.connection)
+        super().__init__(self.connection, self.config.get('arraysize', DEFAULT_ARRAYSIZE))
     
     def _create_connection(self):
         """Crear conexión a Oracle"""
@@ -145,6 +145,38 @@ class OracleMetadataService(DatabaseMetadataService):
         ORDER BY table_name, trigger_name
         """
     
+    def get_change_markers_query(self) -> str:
+        """
+        Retorna la consulta de detección de cambios de Oracle: last_ddl_time de
+        all_objects, last_change de las claves foráneas y num_rows/last_analyzed
+        de las tablas
+        """
+        schema = self.config.get('schema', self.config['user'].upper())
+        return f"""
+        SELECT
+          CASE object_type
+            WHEN 'TABLE' THEN 'table'
+            WHEN 'VIEW' THEN 'view'
+            WHEN 'INDEX' THEN 'index'
+            WHEN 'TRIGGER' THEN 'trigger'
+            ELSE 'function'
+          END AS "object_type",
+          object_type || ' ' || object_name AS "object_name",
+          TO_CHAR(last_ddl_time, 'YYYY-MM-DD HH24:MI:SS') AS "marker"
+        FROM all_objects
+        WHERE owner = '{schema}'
+          AND object_type IN ('TABLE', 'VIEW', 'INDEX', 'TRIGGER', 'FUNCTION', 'PROCEDURE', 'PACKAGE', 'PACKAGE BODY')
+        UNION ALL
+        SELECT 'constraint', constraint_name, TO_CHAR(last_change, 'YYYY-MM-DD HH24:MI:SS')
+        FROM all_constraints
+        WHERE owner = '{schema}'
+          AND constraint_type = 'R'
+        UNION ALL
+        SELECT 'rows', table_name, num_rows || ':' || TO_CHAR(last_analyzed, 'YYYY-MM-DD HH24:MI:SS')
+        FROM all_tables
+        WHERE owner = '{schema}'
+        """
+    
     def _get_specific_vendor_metadata(self, cursor) -> Dict[str, Any]:
         """Obtiene metadatos específicos de Oracle"""
         try:
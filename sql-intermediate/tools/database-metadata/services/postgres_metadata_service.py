@@ -4,8 +4,9 @@ Implementa todas las consultas específicas para PostgreSQL.
 """
 import psycopg
 import logging
+from contextlib import contextmanager
 from typing import Dict, Any
-from .database_metadata_service import DatabaseMetadataService
+from .database_metadata_service import DatabaseMetadataService, DEFAULT_ARRAYSIZE
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +16,7 @@ class PostgresMetadataService(DatabaseMetadataService):
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.connection = self._create_connection()
-        super().__init__(self.connection)
+        super().__init__(self.connection, self.config.get('arraysize', DEFAULT_ARRAYSIZE))
     
     def _create_connection(self):
         """Crear conexión a PostgreSQL"""
@@ -33,6 +34,16 @@ class PostgresMetadataService(DatabaseMetadataService):
             logger.error(f"Error connecting to PostgreSQL: {e}")
             raise
     
+    @contextmanager
+    def _server_cursor(self, connection, query_name: str):
+        """
+        Cursor con nombre (DECLARE ... CURSOR) de psycopg; requiere una
+        transacción explícita porque la conexión trabaja en autocommit
+        """
+        with connection.transaction():
+            with connection.cursor(name=f"metadata_{query_name.lower().replace(' ', '_')}") as cursor:
+                yield cursor
+    
     def get_database_indexes_query(self) -> str:
         """Retorna la consulta SQL para obtener índices de PostgreSQL"""
         schema = self.config.get('schema', 'public')
@@ -155,6 +166,57 @@ class PostgresMetadataService(DatabaseMetadataService):
         ORDER BY t.event_object_table, t.trigger_name
         """
     
+    def get_change_markers_query(self) -> str:
+        """
+        Retorna la consulta de detección de cambios de PostgreSQL: el xmin de
+        las filas de catálogo (pg_class, pg_attribute, pg_rewrite,
+        pg_constraint, pg_trigger, pg_proc) cambia con cada DDL, y reltuples
+        con cada ANALYZE/VACUUM
+        """
+        schema = self.config.get('schema', 'public')
+        return f"""
+        SELECT
+          CASE
+            WHEN c.relkind IN ('v', 'm') THEN 'view'
+            WHEN c.relkind = 'i' THEN 'index'
+            ELSE 'table'
+          END AS object_type,
+          c.relname AS object_name,
+          c.xmin::text
+            || ':' || COALESCE((SELECT string_agg(a.xmin::text, ',' ORDER BY a.attnum)
+                                FROM pg_attribute a WHERE a.attrelid = c.oid), '')
+            || ':' || COALESCE((SELECT string_agg(r.xmin::text, ',' ORDER BY r.oid)
+                                FROM pg_rewrite r WHERE r.ev_class = c.oid), '') AS marker
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = '{schema}'
+          AND c.relkind IN ('r', 'p', 'v', 'm', 'i')
+        UNION ALL
+        SELECT 'rows', c.relname, c.reltuples::text
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = '{schema}'
+          AND c.relkind = 'r'
+        UNION ALL
+        SELECT 'constraint', con.conname, con.xmin::text
+        FROM pg_constraint con
+        JOIN pg_namespace n ON n.oid = con.connamespace
+        WHERE n.nspname = '{schema}'
+          AND con.contype = 'f'
+        UNION ALL
+        SELECT 'trigger', c.relname || '.' || t.tgname, t.xmin::text
+        FROM pg_trigger t
+        JOIN pg_class c ON c.oid = t.tgrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = '{schema}'
+          AND NOT t.tgisinternal
+        UNION ALL
+        SELECT 'function', p.proname || '(' || oidvectortypes(p.proargtypes) || ')', p.xmin::text
+        FROM pg_proc p
+        JOIN pg_namespace n ON n.oid = p.pronamespace
+        WHERE n.nspname = '{schema}'
+        """
+    
     def _get_specific_vendor_metadata(self, cursor) -> Dict[str, Any]:
         """Obtiene metadatos específicos de PostgreSQL"""
         try:
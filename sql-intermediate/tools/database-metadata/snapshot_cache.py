@@ -0,0 +1,99 @@
+"""
+Caché local de snapshots de catálogo para la extracción incremental.
+
+Cada snapshot es un archivo JSON por línea comprimido con gzip, identificado
+por vendor, servidor, puerto, base de datos y schema, que guarda los
+marcadores de cambio de cada objeto (get_change_markers del servicio) junto
+con los resultados crudos de las consultas de metadatos. En la siguiente
+ejecución solo se vuelven a consultar las categorías cuyos objetos cambiaron.
+
+Las listas se guardan con una fila por línea, de modo que ni guardar ni leer
+el snapshot requiere tener una categoría completa en memoria: las que se
+extrajeron en streaming (RowSpool) se vuelven a cargar como RowSpool.
+"""
+import gzip
+import json
+import os
+
+from row_spool import RowSpool, plain_row
+import re
+
+# Categorías de metadatos (claves de METADATA_QUERIES) afectadas por un
+# cambio en cada tipo de objeto de get_change_markers
+AFFECTED_CATEGORIES = {
+    'table': ('table_metadata', 'database_indexes', 'foreign_key_metadata', 'trigger_definitions'),
+    'view': ('table_metadata', 'view_definitions'),
+    'index': ('database_indexes',),
+    'constraint': ('foreign_key_metadata',),
+    'trigger': ('trigger_definitions',),
+    'function': ('function_definitions', 'trigger_definitions'),
+    'rows': ('table_row_count',),
+}
+
+ALL_CATEGORIES = {category for categories in AFFECTED_CATEGORIES.values() for category in categories}
+
+def safe_name(*parts) -> str:
+    """Nombre de archivo a partir de varias partes (vendor, host, puerto, base de datos, schema)"""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', '_'.join(str(part) for part in parts)).strip('_')
+
+def marker_map(rows: list) -> dict:
+    """Convertir las filas de get_change_markers en {tipo:objeto: marcador}"""
+    return {f"{row['object_type']}:{row['object_name']}": str(row['marker']) for row in rows}
+
+def changed_categories(old: dict, new: dict) -> set:
+    """Categorías afectadas por objetos nuevos, eliminados o modificados"""
+    changed = set()
+    for key in old.keys() | new.keys():
+        if old.get(key) != new.get(key):
+            object_type = key.split(':', 1)[0]
+            changed.update(AFFECTED_CATEGORIES.get(object_type, ALL_CATEGORIES))
+    return changed
+
+class SnapshotCache:
+    """Snapshot de catálogo de un schema guardado en disco"""
+    
+    def __init__(self, directory: str, vendor: str, db_config: dict, refresh: bool = False):
+        database = db_config.get('database', db_config.get('service_name', ''))
+        name = safe_name(vendor, db_config.get('host', ''), db_config.get('port', ''), database,
+                         db_config.get('schema', 'default'))
+        self.path = os.path.join(directory, f"{name}.jsonl.gz")
+        self.refresh = refresh
+    
+    def load(self):
+        """Leer el snapshot; retorna None si no existe, es ilegible o se pidió refresh"""
+        if self.refresh:
+            return None
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                markers = json.loads(next(f))['markers']
+                results = {}
+                rows = None
+                for line in f:
+                    entry = json.loads(line)
+                    if 'row' in entry:
+                        rows.append(entry['row'])
+                    elif 'spool' in entry:
+                        rows = results[entry['key']] = RowSpool() if entry['spool'] else []
+                    else:
+                        results[entry['key']] = entry['value']
+            return {'markers': markers, 'results': results}
+        except (FileNotFoundError, OSError, ValueError, KeyError, StopIteration, AttributeError):
+            return None
+    
+    def save(self, markers: dict, results: dict):
+        """
+        Guardar el snapshot de forma atómica (archivo temporal + rename),
+        escribiendo las listas fila a fila
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'markers': markers}) + '\n')
+            for key, value in results.items():
+                if isinstance(value, (list, RowSpool)):
+                    f.write(json.dumps({'key': key, 'spool': isinstance(value, RowSpool)}) + '\n')
+                    for row in value:
+                        f.write(json.dumps({'row': plain_row(row)}, default=str) + '\n')
+                else:
+                    f.write(json.dumps({'key': key, 'value': value}, default=str) + '\n')
+        os.replace(tmp_path, self.path)
@@ -4,18 +4,51 @@ CSV Generator para sistema bancario
 Genera datos sintéticos combinando información de customer y account
 basado en el modelo de datos PostgreSQL adjunto.
 
-Uso: python main.py <numero_de_lineas>
+Uso: python main.py <numero_de_lineas> [--workers N] [--seed S]
 Ejemplo: python main.py 1000
 """
 
+import os
 import sys
 import csv
 import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from faker import Faker
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 # Configurar Faker para datos en español/latino
-fake = Faker(['es_ES', 'es_MX'])
+LOCALES = ['es_ES', 'es_MX']
+fake = Faker(LOCALES)
+
+# Orden de las columnas del CSV
+FIELDNAMES = [
+    'customer_id', 'customer_name', 'customer_address', 
+    'customer_contact', 'customer_username', 'customer_password',
+    'account_id', 'account_type', 'account_balance'
+]
+
+# Filas escritas por bloque en el archivo CSV
+CHUNK_SIZE = 10000
+
+# Tipos de cuenta y rango de balance realista para cada uno
+BALANCE_RANGES = {
+    'savings': (100, 50000),
+    'checking': (0, 15000),
+    'business': (5000, 100000),
+    'premium': (10000, 250000),
+}
+ACCOUNT_TYPES = list(BALANCE_RANGES)
+
+# Distribución de cuentas por cliente
+ACCOUNTS_PER_CUSTOMER = [1, 2, 3]
+ACCOUNTS_PER_CUSTOMER_WEIGHTS = [50, 35, 15]
+
+# Tamaño por defecto de los pools del motor "pool"
+POOL_SIZE = 10000
+
+# Longitud máxima de customer.username en el esquema
+USERNAME_MAX_LENGTH = 50
 
 def generate_customer_data() -> Dict[str, str]:
     """
@@ -38,18 +71,9 @@ def generate_account_data(customer_id: int) -> Dict[str, str]:
     """
     Genera datos para una cuenta bancaria basado en la tabla account
     """
-    account_types = ['savings', 'checking', 'business', 'premium']
-    
     # Generar balance realista según el tipo de cuenta
-    account_type = random.choice(account_types)
-    if account_type == 'business':
-        balance = round(random.uniform(5000, 100000), 2)
-    elif account_type == 'premium':
-        balance = round(random.uniform(10000, 250000), 2)
-    elif account_type == 'savings':
-        balance = round(random.uniform(100, 50000), 2)
-    else:  # checking
-        balance = round(random.uniform(0, 15000), 2)
+    account_type = random.choice(ACCOUNT_TYPES)
+    balance = round(random.uniform(*BALANCE_RANGES[account_type]), 2)
     
     return {
         'account_id': '',  # Se asignará secuencialmente
@@ -58,14 +82,17 @@ def generate_account_data(customer_id: int) -> Dict[str, str]:
         'balance': f"{balance:.2f}"
     }
 
-def generate_combined_data(num_records: int) -> List[Dict[str, str]]:
+def generate_combined_data(num_records: int, first_customer_id: int = 1,
+                           first_account_id: int = 1) -> Iterator[Dict[str, str]]:
     """
     Genera datos combinados de customer y account
     Cada cliente puede tener 1-3 cuentas
+
+    Los registros se producen uno a uno (generador) para que el consumo de
+    memoria sea constante sin importar el valor de num_records.
     """
-    records = []
-    customer_id = 1
-    account_id = 1
+    customer_id = first_customer_id
+    account_id = first_account_id
     
     print(f"🏦 Generando {num_records} registros bancarios...")
     
@@ -73,7 +100,7 @@ def generate_combined_data(num_records: int) -> List[Dict[str, str]]:
     customer_accounts = 0
     max_accounts_per_customer = 0
     
-    for i in range(num_records):
+    for _ in range(num_records):
         # Decidir si crear nuevo cliente o nueva cuenta para cliente existente
         if current_customer is None or customer_accounts >= max_accounts_per_customer:
             # Crear nuevo cliente
@@ -81,7 +108,8 @@ def generate_combined_data(num_records: int) -> List[Dict[str, str]]:
             current_customer['customer_id'] = customer_id
             customer_id += 1
             customer_accounts = 0
-            max_accounts_per_customer = random.choices([1, 2, 3], weights=[50, 35, 15])[0]
+            max_accounts_per_customer = random.choices(ACCOUNTS_PER_CUSTOMER,
+                                                       weights=ACCOUNTS_PER_CUSTOMER_WEIGHTS)[0]
         
         # Crear cuenta para el cliente actual
         account_data = generate_account_data(current_customer['customer_id'])
@@ -90,7 +118,7 @@ def generate_combined_data(num_records: int) -> List[Dict[str, str]]:
         customer_accounts += 1
         
         # Combinar datos de customer y account en un solo registro
-        combined_record = {
+        yield {
             # Datos del cliente
             'customer_id': current_customer['customer_id'],
             'customer_name': current_customer['name'],
@@ -104,73 +132,344 @@ def generate_combined_data(num_records: int) -> List[Dict[str, str]]:
             'account_type': account_data['type'],
             'account_balance': account_data['balance']
         }
+
+class ValuePool:
+    """
+    Valores de Faker pre-generados una sola vez para el motor "pool"
+
+    Nombres y apellidos se guardan por separado para que la combinación de
+    ambos ofrezca size * size nombres distintos.
+    """
+    
+    def __init__(self, size: int = POOL_SIZE):
+        print(f"🧺 Pre-generando pools de {size} valores...")
+        self.first_names = [fake.first_name() for _ in range(size)]
+        self.last_names = [fake.last_name() for _ in range(size)]
+        self.addresses = [fake.address().replace('\n', ', ') for _ in range(size)]
+        self.contacts = [fake.phone_number() for _ in range(size)]
+        self.usernames = [fake.user_name() for _ in range(size)]
+        self.passwords = [
+            fake.password(length=12, special_chars=True, digits=True, upper_case=True)
+            for _ in range(size)
+        ]
+
+def generate_pooled_data(num_records: int, pool: ValuePool, first_customer_id: int = 1,
+                         first_account_id: int = 1,
+                         block_size: int = CHUNK_SIZE) -> Iterator[Dict[str, str]]:
+    """
+    Genera datos combinados de customer y account componiendo valores de los pools
+
+    En lugar de llamar a Faker por fila, cada bloque de block_size cuentas se
+    construye muestreando índices de los pools en lote con random.choices, y
+    los balances se sortean en lote según el tipo de cuenta. El username se
+    hace único añadiendo "_" y el account_id de la primera cuenta del cliente,
+    que es único también entre shards (el separador evita que ana1 + 23 y
+    ana12 + 3 colisionen).
+    """
+    customer_id = first_customer_id
+    account_id = first_account_id
+    remaining = num_records
+    
+    print(f"🏦 Generando {num_records} registros bancarios (motor pool)...")
+    
+    while remaining > 0:
+        # Planificar el bloque: cuántas cuentas tiene cada cliente
+        plan = []
+        planned = 0
+        while planned < min(block_size, remaining):
+            accounts = random.choices(ACCOUNTS_PER_CUSTOMER, weights=ACCOUNTS_PER_CUSTOMER_WEIGHTS)[0]
+            accounts = min(accounts, remaining - planned)
+            plan.append(accounts)
+            planned += accounts
+        
+        # Muestreo en lote de los campos del cliente
+        customers = len(plan)
+        first_names = random.choices(pool.first_names, k=customers)
+        last_names = random.choices(pool.last_names, k=customers)
+        addresses = random.choices(pool.addresses, k=customers)
+        contacts = random.choices(pool.contacts, k=customers)
+        usernames = random.choices(pool.usernames, k=customers)
+        passwords = random.choices(pool.passwords, k=customers)
         
-        records.append(combined_record)
+        # Muestreo en lote de los campos de la cuenta
+        account_types = random.choices(ACCOUNT_TYPES, k=planned)
+        balances = [
+            f"{round(random.uniform(*BALANCE_RANGES[account_type]), 2):.2f}"
+            for account_type in account_types
+        ]
         
-        # Mostrar progreso cada 100 registros
-        if (i + 1) % 100 == 0:
-            print(f"📊 Progreso: {i + 1}/{num_records} registros generados")
+        position = 0
+        for index, accounts in enumerate(plan):
+            suffix = f"_{account_id}"
+            username = usernames[index][:USERNAME_MAX_LENGTH - len(suffix)] + suffix
+            name = f"{first_names[index]} {last_names[index]}"
+            
+            for _ in range(accounts):
+                yield {
+                    'customer_id': customer_id,
+                    'customer_name': name,
+                    'customer_address': addresses[index],
+                    'customer_contact': contacts[index],
+                    'customer_username': username,
+                    'customer_password': passwords[index],
+                    'account_id': account_id,
+                    'account_type': account_types[position],
+                    'account_balance': balances[position]
+                }
+                account_id += 1
+                position += 1
+            customer_id += 1
+        
+        remaining -= planned
+
+def generate_records(num_records: int, engine: str = 'faker', pool_size: int = POOL_SIZE,
+                     first_account_id: int = 1) -> Iterator[Dict[str, str]]:
+    """
+    Devuelve el generador de registros del motor indicado ("faker" o "pool")
+    """
+    if engine == 'pool':
+        return generate_pooled_data(num_records, ValuePool(pool_size),
+                                    first_account_id=first_account_id)
+    return generate_combined_data(num_records, first_account_id=first_account_id)
+
+def write_records(writer, records: Iterable[Dict[str, str]], chunk_size: int = CHUNK_SIZE,
+                  show_progress: bool = True) -> Dict[str, int]:
+    """
+    Escribe los registros con un csv.writer en bloques de chunk_size filas
+
+    Las estadísticas se calculan al vuelo: como los customer_id son
+    secuenciales basta con detectar el cambio de cliente.
+    """
+    stats = {'customers': 0, 'accounts': 0}
+    last_customer_id = None
+    chunk = []
+    
+    for record in records:
+        if record['customer_id'] != last_customer_id:
+            last_customer_id = record['customer_id']
+            stats['customers'] += 1
+        stats['accounts'] += 1
+        
+        chunk.append([record[field] for field in FIELDNAMES])
+        if len(chunk) >= chunk_size:
+            writer.writerows(chunk)
+            chunk.clear()
+            if show_progress:
+                print(f"📊 Progreso: {stats['accounts']} registros escritos")
+    
+    if chunk:
+        writer.writerows(chunk)
     
-    return records
+    return stats
 
-def save_to_csv(records: List[Dict[str, str]], filename: str = 'data.csv'):
+def save_to_csv(records: Iterable[Dict[str, str]], filename: str = 'data.csv',
+                chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
     """
     Guarda los datos generados en un archivo CSV
+
+    Los registros se consumen de forma incremental, por lo que el consumo de
+    memoria no depende del número de filas.
     """
-    if not records:
-        print("❌ No hay datos para guardar")
-        return
-    
     print(f"💾 Guardando datos en {filename}...")
     
-    # Definir el orden de las columnas
-    fieldnames = [
-        'customer_id', 'customer_name', 'customer_address', 
-        'customer_contact', 'customer_username', 'customer_password',
-        'account_id', 'account_type', 'account_balance'
-    ]
+    stats = {'customers': 0, 'accounts': 0}
     
     try:
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
             
             # Escribir encabezados
-            writer.writeheader()
+            writer.writerow(FIELDNAMES)
             
-            # Escribir datos
-            writer.writerows(records)
-        
-        print(f"✅ Archivo {filename} creado exitosamente")
-        print(f"📈 Total de registros: {len(records)}")
+            # Escribir datos por bloques
+            stats = write_records(writer, records, chunk_size)
         
-        # Mostrar estadísticas
-        customers = len(set(record['customer_id'] for record in records))
-        accounts = len(records)
-        avg_accounts = accounts / customers if customers > 0 else 0
+        if stats['accounts'] == 0:
+            print("❌ No hay datos para guardar")
+            return stats
         
-        print(f"👥 Clientes únicos: {customers}")
-        print(f"🏦 Total de cuentas: {accounts}")
-        print(f"📊 Promedio de cuentas por cliente: {avg_accounts:.1f}")
+        print(f"✅ Archivo {filename} creado exitosamente")
+        print_statistics(stats)
         
     except Exception as e:
         print(f"❌ Error al guardar el archivo: {e}")
+    
+    return stats
+
+def plan_shards(num_records: int, workers: int) -> List[Tuple[int, int]]:
+    """
+    Divide el rango de account_id en shards disjuntos y contiguos
+
+    Returns:
+        Lista de tuplas (primer account_id, número de registros) por shard
+    """
+    shard_count = max(1, min(workers, num_records))
+    base, remainder = divmod(num_records, shard_count)
+    
+    shards = []
+    first_account_id = 1
+    for index in range(shard_count):
+        size = base + (1 if index < remainder else 0)
+        shards.append((first_account_id, size))
+        first_account_id += size
+    return shards
+
+def _init_generators(seed: int):
+    """
+    Crea una instancia de Faker propia del proceso y la inicializa con la semilla
+
+    También se inicializa el módulo random, que usan tanto las cuentas como
+    el proxy multi-locale de Faker para elegir el locale de cada valor.
+    """
+    global fake
+    fake = Faker(LOCALES)
+    fake.seed_instance(seed)
+    random.seed(seed)
+
+def _generate_shard(task: Tuple[int, int, int, str, str, int]) -> Dict[str, int]:
+    """
+    Genera un shard dentro de un proceso worker y lo escribe en un archivo parcial
+
+    Los customer_id del shard empiezan en 1; se desplazan al unir los archivos.
+    """
+    first_account_id, num_records, seed, part_file, engine, pool_size = task
+    _init_generators(seed)
+    
+    records = generate_records(num_records, engine, pool_size, first_account_id)
+    with open(part_file, 'w', newline='', encoding='utf-8') as csvfile:
+        return write_records(csv.writer(csvfile), records, show_progress=False)
 
-def print_usage():
+def merge_parts(part_files: List[str], part_stats: List[Dict[str, int]], filename: str,
+                chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
     """
-    Muestra instrucciones de uso
+    Concatena los archivos parciales en orden, desplazando los customer_id de cada
+    shard para que sigan siendo contiguos y únicos en todo el archivo
     """
-    print("🏦 CSV Generator - Sistema Bancario")
-    print("=" * 40)
-    print("Uso: python main.py <numero_de_lineas>")
-    print()
-    print("Ejemplos:")
-    print("  python main.py 100     # Genera 100 registros")
-    print("  python main.py 1000    # Genera 1000 registros")
-    print("  python main.py 5000    # Genera 5000 registros")
-    print()
-    print("El archivo generado combina datos de:")
-    print("  ✓ Tabla customer (cliente)")
-    print("  ✓ Tabla account (cuenta bancaria)")
+    stats = {'customers': 0, 'accounts': 0}
+    
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(FIELDNAMES)
+        
+        for part_file, part in zip(part_files, part_stats):
+            offset = stats['customers']
+            with open(part_file, 'r', newline='', encoding='utf-8') as partfile:
+                chunk = []
+                for row in csv.reader(partfile):
+                    row[0] = int(row[0]) + offset
+                    chunk.append(row)
+                    if len(chunk) >= chunk_size:
+                        writer.writerows(chunk)
+                        chunk.clear()
+                if chunk:
+                    writer.writerows(chunk)
+            
+            os.remove(part_file)
+            stats['customers'] += part['customers']
+            stats['accounts'] += part['accounts']
+            print(f"📊 Progreso: {stats['accounts']} registros escritos")
+    
+    return stats
+
+def generate_parallel(num_records: int, workers: int, filename: str = 'data.csv',
+                      engine: str = 'faker', pool_size: int = POOL_SIZE) -> Dict[str, int]:
+    """
+    Genera el CSV usando varios procesos, cada uno con su propia instancia de Faker
+
+    Cada worker genera un rango disjunto de account_id en un archivo parcial;
+    al final los archivos se concatenan en orden en filename.
+    """
+    shards = plan_shards(num_records, workers)
+    seeds = [random.randrange(2 ** 32) for _ in shards]
+    part_files = [f"{filename}.part{index:03d}" for index in range(len(shards))]
+    tasks = [
+        (first_account_id, size, seed, part_file, engine, pool_size)
+        for (first_account_id, size), seed, part_file in zip(shards, seeds, part_files)
+    ]
+    
+    print(f"⚙️  Generando {num_records} registros en {len(shards)} procesos...")
+    
+    try:
+        with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+            part_stats = list(executor.map(_generate_shard, tasks))
+        
+        print(f"💾 Uniendo {len(part_files)} archivos parciales en {filename}...")
+        stats = merge_parts(part_files, part_stats, filename)
+    finally:
+        for part_file in part_files:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+    
+    print(f"✅ Archivo {filename} creado exitosamente")
+    print_statistics(stats)
+    return stats
+
+def print_statistics(stats: Dict[str, int]):
+    """
+    Muestra las estadísticas de clientes y cuentas generados
+    """
+    customers = stats['customers']
+    accounts = stats['accounts']
+    avg_accounts = accounts / customers if customers > 0 else 0
+    
+    print(f"📈 Total de registros: {accounts}")
+    print(f"👥 Clientes únicos: {customers}")
+    print(f"🏦 Total de cuentas: {accounts}")
+    print(f"📊 Promedio de cuentas por cliente: {avg_accounts:.1f}")
+
+def parse_arguments():
+    """
+    Parsea los argumentos de línea de comandos
+    """
+    parser = argparse.ArgumentParser(
+        description='Genera un CSV con datos sintéticos de clientes y cuentas bancarias.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  uv run csv-generate 100                # Genera 100 registros
+  uv run csv-generate 1000               # Genera 1000 registros
+  uv run csv-generate 1000000 --workers 8
+  uv run csv-generate 1000000 --engine pool --pool-size 50000
+  uv run csv-generate 1000000 --workers 8 --seed 42   # Reproducible
+
+El archivo generado combina datos de:
+  ✓ Tabla customer (cliente)
+  ✓ Tabla account (cuenta bancaria)
+        """
+    )
+    parser.add_argument(
+        'num_records',
+        type=int,
+        help='Número de registros (cuentas) a generar',
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Número de procesos para generar los datos en paralelo (default: 1)',
+    )
+    parser.add_argument(
+        '--engine', '-e',
+        type=str,
+        default='faker',
+        choices=['faker', 'pool'],
+        help='Motor de generación: faker (una llamada por fila) o pool '
+             '(valores pre-generados y muestreo en lote) (default: faker)',
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=int,
+        default=POOL_SIZE,
+        help=f'Valores distintos por campo en el motor pool (default: {POOL_SIZE})',
+    )
+    parser.add_argument(
+        '--seed', '-s',
+        type=int,
+        default=None,
+        help='Semilla para generar exactamente el mismo archivo en cada ejecución '
+             '(con el mismo número de registros, workers y motor)',
+    )
+    return parser.parse_args()
 
 def main():
     """
@@ -179,39 +478,44 @@ def main():
     print("🏦 Generador de CSV - Sistema Bancario")
     print("=" * 45)
     
-    # Validar argumentos
-    if len(sys.argv) != 2:
-        print("❌ Número incorrecto de argumentos")
-        print()
-        print_usage()
+    args = parse_arguments()
+    num_records = args.num_records
+    
+    if num_records <= 0:
+        print("❌ El número de registros debe ser mayor a 0")
         sys.exit(1)
     
-    try:
-        num_records = int(sys.argv[1])
-        
-        if num_records <= 0:
-            print("❌ El número de registros debe ser mayor a 0")
-            sys.exit(1)
-        
-        if num_records > 100000:
-            confirm = input(f"⚠️  Vas a generar {num_records} registros. ¿Continuar? (y/N): ")
-            if confirm.lower() != 'y':
-                print("🚫 Operación cancelada")
-                sys.exit(0)
-    
-    except ValueError:
-        print("❌ El argumento debe ser un número entero")
-        print()
-        print_usage()
+    if args.workers <= 0:
+        print("❌ El número de workers debe ser mayor a 0")
+        sys.exit(1)
+    
+    if args.pool_size <= 0:
+        print("❌ El tamaño del pool debe ser mayor a 0")
         sys.exit(1)
     
+    if num_records > 100000:
+        confirm = input(f"⚠️  Vas a generar {num_records} registros. ¿Continuar? (y/N): ")
+        if confirm.lower() != 'y':
+            print("🚫 Operación cancelada")
+            sys.exit(0)
+    
+    if args.seed is not None:
+        # Las semillas de cada shard se derivan de esta, por lo que también
+        # el modo --workers es determinista
+        print(f"🎲 Semilla: {args.seed}")
+        _init_generators(args.seed)
+    
     # Generar datos
     try:
         print(f"🚀 Iniciando generación de {num_records} registros...")
-        records = generate_combined_data(num_records)
-        
-        # Guardar en CSV
-        save_to_csv(records)
+        if args.workers > 1:
+            generate_parallel(num_records, args.workers, engine=args.engine,
+                              pool_size=args.pool_size)
+        else:
+            records = generate_records(num_records, args.engine, args.pool_size)
+            
+            # Guardar en CSV (los registros se generan y escriben en streaming)
+            save_to_csv(records)
         
         print("🎉 ¡Generación completada exitosamente!")
         
@@ -6,6 +6,12 @@ CSV to PostgreSQL SQL Importer
 Script para importar datos de clientes y cuentas desde CSV y generar archivos SQL
 siguiendo las buenas prácticas de PostgreSQL 12.
 
+Con --mode copy los datos validados se cargan directamente en PostgreSQL usando
+COPY ... FROM STDIN, reutilizando la configuración de database_inserts.
+
+Con --dialect el SQL generado se adapta a PostgreSQL, SQL Server u Oracle
+(ver tables/*.sql para el esquema de cada vendor).
+
 Autor: Sistema de Importación Bancaria
 Fecha: Septiembre 2025
 """
@@ -13,11 +19,33 @@ Fecha: Septiembre 2025
 import csv
 import os
 import sys
+import shutil
+import argparse
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from datetime import datetime
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, Iterator, List, TextIO, Tuple, Optional
 from decimal import Decimal, InvalidOperation
 import logging
 
+from csv_importer.dedup_index import CustomerIdBitmap, UsernameHashSet, MAX_CUSTOMER_ID
+from csv_importer.sql_writer import BatchInsertWriter, DEFAULT_BATCH_SIZE, DIALECTS
+
+
+# Bytes aproximados por fila del CSV, para dimensionar los índices de dedup
+ESTIMATED_ROW_BYTES = 120
+
+# Tamaño objetivo en bytes de cada bloque validado en paralelo
+CHUNK_BYTES = 1 << 20
+
+# Descripciones usadas en los archivos SQL generados
+CUSTOMERS_DESCRIPTION = 'Importación de datos de clientes desde CSV'
+ACCOUNTS_DESCRIPTION = 'Importación de datos de cuentas desde CSV'
+CUSTOMERS_COMMENT = 'Tabla de clientes importada desde CSV'
+ACCOUNTS_COMMENT = 'Tabla de cuentas importada desde CSV'
+
 
 class CSVImportError(Exception):
     """Excepción personalizada para errores de importación"""
@@ -29,25 +57,91 @@ class ValidationError(Exception):
     pass
 
 
+def plan_byte_ranges(csv_file_path: str, data_offset: int, workers: int,
+                     chunk_bytes: int = CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """
+    Divide el archivo en rangos de bytes alineados a inicio de línea
+    
+    Requiere que cada registro ocupe una sola línea física (sin saltos de
+    línea dentro de campos entrecomillados), como produce csv-generate.
+    
+    Returns:
+        Lista de tuplas (inicio, fin) que cubren [data_offset, tamaño del archivo)
+    """
+    size = os.path.getsize(csv_file_path)
+    chunks = max(workers, -(-(size - data_offset) // chunk_bytes))
+    step = max(1, (size - data_offset) // chunks)
+    
+    boundaries = [data_offset]
+    with open(csv_file_path, 'rb') as file:
+        position = data_offset + step
+        while position < size:
+            file.seek(position)
+            file.readline()  # Avanzar hasta el inicio de la siguiente línea
+            boundary = file.tell()
+            if boundary >= size:
+                break
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+            position = boundary + step
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _read_lines(file, end: int) -> Iterator[str]:
+    """Lee líneas decodificadas hasta alcanzar la posición end"""
+    while file.tell() < end:
+        line = file.readline()
+        if not line:
+            break
+        yield line.decode('utf-8')
+
+
+def _validate_chunk(task: Tuple[str, int, int, List[str]]) -> List[Tuple]:
+    """Valida las filas de un rango de bytes del CSV dentro de un proceso worker"""
+    csv_file_path, start, end, fieldnames = task
+    with open(csv_file_path, 'rb') as file:
+        file.seek(start)
+        reader = csv.DictReader(_read_lines(file, end), fieldnames=fieldnames)
+        return [CSVImporter._validate_row(row) for row in reader]
+
+
 class CSVImporter:
     """Importador de datos CSV a SQL para PostgreSQL"""
     
     # Tipos de cuenta válidos según el esquema
     VALID_ACCOUNT_TYPES = {'checking', 'savings', 'premium', 'business'}
     
-    def __init__(self, csv_file_path: str, output_dir: str = './output'):
+    # Columnas de destino en cada tabla
+    CUSTOMER_COLUMNS = ('customer_id', 'name', 'address', 'contact', 'username', 'password')
+    ACCOUNT_COLUMNS = ('account_id', 'customer_id', 'type', 'balance')
+    
+    def __init__(self, csv_file_path: str, output_dir: str = './output',
+                 batch_size: int = DEFAULT_BATCH_SIZE, index_dir: Optional[str] = None,
+                 workers: int = 1, dialect: str = 'postgres'):
         """
         Inicializa el importador
         
         Args:
             csv_file_path: Ruta al archivo CSV
             output_dir: Directorio de salida para archivos SQL
+            batch_size: Máximo de filas por sentencia INSERT
+            index_dir: Directorio para respaldar los índices de dedup con mmap
+                (None los mantiene en memoria)
+            workers: Procesos para validar el CSV en paralelo
+            dialect: Dialecto SQL de los archivos generados (postgres, mssql, oracle)
         """
         self.csv_file_path = csv_file_path
         self.output_dir = output_dir
+        self.batch_size = batch_size
+        self.index_dir = index_dir
+        self.workers = workers
+        self.dialect = DIALECTS[dialect]
         self.customers: Dict[int, Dict] = {}
         self.accounts: List[Dict] = []
         self.errors: List[Dict] = []
+        # En modo streaming el detalle de errores se vuelca a disco
+        self.error_spool: Optional[TextIO] = None
         self.stats = {
             'total_rows': 0,
             'processed_rows': 0,
@@ -77,20 +171,24 @@ class CSVImporter:
         )
         self.logger = logging.getLogger(__name__)
     
-    def _validate_customer_data(self, row: Dict, line_number: int) -> Optional[Dict]:
+    @classmethod
+    def _validate_customer_data(cls, row: Dict) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Valida los datos de un cliente
         
         Args:
             row: Fila del CSV como diccionario
-            line_number: Número de línea para reporte de errores
             
         Returns:
-            Diccionario con datos del cliente válidos o None si hay errores
+            Tupla (datos del cliente válidos, None) o (None, mensaje de error)
         """
         try:
             # Validar customer_id
             customer_id = int(row['customer_id'])
+            if customer_id <= 0:
+                raise ValidationError(f"customer_id debe ser positivo: {customer_id}")
+            if customer_id > MAX_CUSTOMER_ID:
+                raise ValidationError(f"customer_id fuera del rango INT: {customer_id}")
             
             # Validar campos obligatorios
             required_fields = ['customer_name', 'customer_username', 'customer_password']
@@ -115,22 +213,21 @@ class CSVImporter:
                 'contact': row.get('customer_contact', '').strip()[:50],
                 'username': username,
                 'password': row['customer_password'].strip()[:100]
-            }
+            }, None
             
         except (ValueError, ValidationError) as e:
-            self._log_error(line_number, 'customer_validation', str(e), row)
-            return None
+            return None, str(e)
     
-    def _validate_account_data(self, row: Dict, line_number: int) -> Optional[Dict]:
+    @classmethod
+    def _validate_account_data(cls, row: Dict) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Valida los datos de una cuenta
         
         Args:
             row: Fila del CSV como diccionario
-            line_number: Número de línea para reporte de errores
             
         Returns:
-            Diccionario con datos de la cuenta válidos o None si hay errores
+            Tupla (datos de la cuenta válidos, None) o (None, mensaje de error)
         """
         try:
             # Validar account_id
@@ -139,7 +236,7 @@ class CSVImporter:
             
             # Validar tipo de cuenta
             account_type = row.get('account_type', '').strip().lower()
-            if account_type not in self.VALID_ACCOUNT_TYPES:
+            if account_type not in cls.VALID_ACCOUNT_TYPES:
                 raise ValidationError(f"Tipo de cuenta inválido: {account_type}")
             
             # Validar balance
@@ -155,11 +252,26 @@ class CSVImporter:
                 'customer_id': customer_id,
                 'type': account_type,
                 'balance': balance
-            }
+            }, None
             
         except (ValueError, ValidationError) as e:
-            self._log_error(line_number, 'account_validation', str(e), row)
-            return None
+            return None, str(e)
+    
+    @classmethod
+    def _validate_row(cls, row: Dict) -> Tuple[Dict, Optional[Dict], Optional[str],
+                                               Optional[Dict], Optional[str]]:
+        """
+        Valida cliente y cuenta de una fila sin depender de filas anteriores
+        
+        Es la parte costosa y paralelizable de la validación; la detección de
+        duplicados se aplica después, en orden, en _iter_valid_rows.
+        
+        Returns:
+            Tupla (fila, cliente, error de cliente, cuenta, error de cuenta)
+        """
+        customer_data, customer_error = cls._validate_customer_data(row)
+        account_data, account_error = cls._validate_account_data(row)
+        return row, customer_data, customer_error, account_data, account_error
     
     def _log_error(self, line_number: int, error_type: str, message: str, row: Dict):
         """Registra un error de validación"""
@@ -169,39 +281,63 @@ class CSVImporter:
             'message': message,
             'data': row
         }
-        self.errors.append(error_record)
+        if self.error_spool is not None:
+            self._write_error_entry(self.error_spool, error_record)
+        else:
+            self.errors.append(error_record)
         self.stats['errors'] += 1
         self.logger.warning(f"Línea {line_number} - {error_type}: {message}")
     
-    def process_csv(self):
-        """Procesa el archivo CSV línea por línea"""
-        self.logger.info(f"Iniciando procesamiento de {self.csv_file_path}")
+    @staticmethod
+    def _write_error_entry(f: TextIO, error: Dict):
+        """Escribe el detalle de un error en el reporte"""
+        f.write(f"\nLínea {error['line']} - {error['type']}: {error['message']}\n")
+        f.write(f"Datos: {error['data']}\n")
+        f.write("-" * 80 + "\n")
+    
+    def _iter_valid_rows(self) -> Iterator[Tuple[Optional[Dict], Dict]]:
+        """
+        Lee y valida el CSV línea por línea
         
-        try:
-            with open(self.csv_file_path, 'r', encoding='utf-8') as file:
-                csv_reader = csv.DictReader(file)
-                
-                # Verificar headers
-                expected_headers = {
-                    'customer_id', 'customer_name', 'customer_address', 
-                    'customer_contact', 'customer_username', 'customer_password',
-                    'account_id', 'account_type', 'account_balance'
-                }
-                
-                if not expected_headers.issubset(set(csv_reader.fieldnames)):
-                    missing = expected_headers - set(csv_reader.fieldnames)
-                    raise CSVImportError(f"Headers faltantes en CSV: {missing}")
-                
-                usernames_seen: Set[str] = set()
-                line_number = 1  # Empezar en 1 porque la línea 0 son headers
-                
-                for row in csv_reader:
+        Solo conserva el estado necesario para detectar duplicados: un bitmap
+        de ids de cliente y un conjunto de huellas de 64 bits de usernames.
+        Con workers > 1 la validación por fila se reparte en procesos y aquí
+        solo se aplica, en el orden del archivo, la detección de duplicados.
+        
+        Yields:
+            Tupla (cliente, cuenta) por cada fila válida; cliente es None si
+            el cliente ya apareció en una fila anterior
+        """
+        with open(self.csv_file_path, 'r', encoding='utf-8') as file:
+            csv_reader = csv.DictReader(file)
+            
+            # Verificar headers
+            expected_headers = {
+                'customer_id', 'customer_name', 'customer_address', 
+                'customer_contact', 'customer_username', 'customer_password',
+                'account_id', 'account_type', 'account_balance'
+            }
+            
+            if not expected_headers.issubset(set(csv_reader.fieldnames)):
+                missing = expected_headers - set(csv_reader.fieldnames)
+                raise CSVImportError(f"Headers faltantes en CSV: {missing}")
+            
+            if self.workers > 1:
+                validated_rows = self._validate_parallel(csv_reader.fieldnames)
+            else:
+                validated_rows = map(self._validate_row, csv_reader)
+            
+            usernames_seen, customer_ids_seen = self._create_dedup_indexes()
+            line_number = 1  # Empezar en 1 porque la línea 0 son headers
+            
+            try:
+                for row, customer_data, customer_error, account_data, account_error in validated_rows:
                     line_number += 1
                     self.stats['total_rows'] += 1
                     
                     # Validar datos del cliente
-                    customer_data = self._validate_customer_data(row, line_number)
                     if customer_data is None:
+                        self._log_error(line_number, 'customer_validation', customer_error, row)
                         continue
                     
                     # Verificar unicidad de username
@@ -212,21 +348,73 @@ class CSVImporter:
                         continue
                     
                     # Validar datos de la cuenta
-                    account_data = self._validate_account_data(row, line_number)
                     if account_data is None:
+                        self._log_error(line_number, 'account_validation', account_error, row)
                         continue
                     
                     # Registrar cliente (solo si es nuevo)
                     customer_id = customer_data['customer_id']
-                    if customer_id not in self.customers:
-                        self.customers[customer_id] = customer_data
+                    if customer_id in customer_ids_seen:
+                        customer_data = None
+                    else:
+                        customer_ids_seen.add(customer_id)
                         usernames_seen.add(username)
                         self.stats['unique_customers'] += 1
                     
                     # Registrar cuenta
-                    self.accounts.append(account_data)
                     self.stats['total_accounts'] += 1
                     self.stats['processed_rows'] += 1
+                    yield customer_data, account_data
+            finally:
+                usernames_seen.close()
+                customer_ids_seen.close()
+    
+    def _validate_parallel(self, fieldnames: List[str]) -> Iterator[Tuple]:
+        """
+        Valida el CSV en un pool de procesos por rangos de bytes
+        
+        Los resultados se consumen en el orden del archivo y solo se mantienen
+        en vuelo 2 * workers bloques, para acotar la memoria.
+        
+        Args:
+            fieldnames: Columnas leídas del encabezado
+        """
+        with open(self.csv_file_path, 'rb') as file:
+            file.readline()  # Saltar encabezado
+            data_offset = file.tell()
+        
+        ranges = plan_byte_ranges(self.csv_file_path, data_offset, self.workers)
+        tasks = iter((self.csv_file_path, start, end, fieldnames) for start, end in ranges)
+        self.logger.info(f"Validando {len(ranges)} bloques con {self.workers} procesos")
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque(executor.submit(_validate_chunk, task)
+                            for task in islice(tasks, 2 * self.workers))
+            while pending:
+                results = pending.popleft().result()
+                for task in islice(tasks, 1):
+                    pending.append(executor.submit(_validate_chunk, task))
+                yield from results
+    
+    def _create_dedup_indexes(self) -> Tuple[UsernameHashSet, CustomerIdBitmap]:
+        """Crea los índices de dedup dimensionados según el tamaño del CSV"""
+        try:
+            estimated_rows = os.path.getsize(self.csv_file_path) // ESTIMATED_ROW_BYTES
+        except OSError:
+            estimated_rows = 0
+        capacity = max(estimated_rows, 1 << 16)
+        return (UsernameHashSet(capacity, self.index_dir),
+                CustomerIdBitmap(capacity, self.index_dir))
+    
+    def process_csv(self):
+        """Procesa el archivo CSV línea por línea"""
+        self.logger.info(f"Iniciando procesamiento de {self.csv_file_path}")
+        
+        try:
+            for customer_data, account_data in self._iter_valid_rows():
+                if customer_data is not None:
+                    self.customers[customer_data['customer_id']] = customer_data
+                self.accounts.append(account_data)
                 
         except FileNotFoundError:
             raise CSVImportError(f"Archivo CSV no encontrado: {self.csv_file_path}")
@@ -235,50 +423,60 @@ class CSVImporter:
         
         self.logger.info(f"Procesamiento completado. Estadísticas: {self.stats}")
     
+    def _format_customer_values(self, customer: Dict) -> str:
+        """Formatea un cliente como tupla VALUES con literales escapados"""
+        string = self.dialect.string
+        return (f"({customer['customer_id']}, {string(customer['name'])}, "
+                f"{string(customer['address'])}, {string(customer['contact'])}, "
+                f"{string(customer['username'])}, {string(customer['password'])})")
+    
+    def _format_account_values(self, account: Dict) -> str:
+        """Formatea una cuenta como tupla VALUES"""
+        return (f"({account['account_id']}, {account['customer_id']}, "
+                f"{self.dialect.string(account['type'])}, {account['balance']})")
+    
+    def _sql_header(self, file_name: str, description: str, summary: List[str],
+                    table: str, section: str) -> str:
+        """Construye el encabezado común de los archivos SQL generados"""
+        summary_lines = ''.join(f"-- {line}\n" for line in summary)
+        return f"""-- {file_name}
+-- Archivo generado automáticamente el {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+-- {description}
+-- Dialecto: {self.dialect.name}
+{summary_lines}
+{self.dialect.begin()}
+-- {section}
+{self.dialect.before_inserts(table)}"""
+    
+    def _sql_footer(self, table: str, id_column: str, comment: str) -> str:
+        """Construye el cierre común de los archivos SQL generados"""
+        sync_identity = self.dialect.sync_identity(table, id_column)
+        if sync_identity:
+            sync_identity = f"\n-- Sincronizar el generador de ids con los ids importados\n{sync_identity}"
+        return f"""{self.dialect.after_inserts(table)}{self.dialect.commit()}{sync_identity}
+-- Comentarios sobre la importación
+{self.dialect.table_comment(table, comment)}"""
+    
     def generate_customers_sql(self) -> str:
         """Genera el archivo customers.sql"""
         output_file = os.path.join(self.output_dir, 'customers.sql')
         
         with open(output_file, 'w', encoding='utf-8') as f:
             # Header con metadatos
-            f.write(f"""-- customers.sql
--- Archivo generado automáticamente el {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
--- Importación de datos de clientes desde CSV
--- Total de clientes únicos: {self.stats['unique_customers']}
--- Errores encontrados: {self.stats['errors']}
-
--- Iniciar transacción
-BEGIN;
-
--- Insertar datos de clientes
-""")
+            f.write(self._sql_header('customers.sql', CUSTOMERS_DESCRIPTION, [
+                f"Total de clientes únicos: {self.stats['unique_customers']}",
+                f"Errores encontrados: {self.stats['errors']}",
+            ], 'customer', 'Insertar datos de clientes'))
             
             if self.customers:
-                f.write("INSERT INTO customer (customer_id, name, address, contact, username, password) VALUES\n")
-                
-                customer_values = []
+                writer = BatchInsertWriter(f, 'customer', self.CUSTOMER_COLUMNS, self.batch_size, self.dialect)
                 for customer in self.customers.values():
-                    # Escapar comillas simples para SQL
-                    name = customer['name'].replace("'", "''")
-                    address = customer['address'].replace("'", "''")
-                    contact = customer['contact'].replace("'", "''")
-                    username = customer['username'].replace("'", "''")
-                    password = customer['password'].replace("'", "''")
-                    
-                    value_line = f"    ({customer['customer_id']}, '{name}', '{address}', '{contact}', '{username}', '{password}')"
-                    customer_values.append(value_line)
-                
-                f.write(",\n".join(customer_values))
-                f.write(";\n\n")
+                    writer.add(self._format_customer_values(customer))
+                writer.flush()
             else:
                 f.write("-- No hay datos de clientes válidos para insertar\n\n")
             
-            f.write("""-- Confirmar transacción
-COMMIT;
-
--- Comentarios sobre la importación
-COMMENT ON TABLE customer IS 'Tabla de clientes importada desde CSV';
-""")
+            f.write(self._sql_footer('customer', 'customer_id', CUSTOMERS_COMMENT))
         
         self.logger.info(f"Archivo customers.sql generado: {output_file}")
         return output_file
@@ -289,41 +487,123 @@ COMMENT ON TABLE customer IS 'Tabla de clientes importada desde CSV';
         
         with open(output_file, 'w', encoding='utf-8') as f:
             # Header con metadatos
-            f.write(f"""-- accounts.sql
--- Archivo generado automáticamente el {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
--- Importación de datos de cuentas desde CSV
--- Total de cuentas: {self.stats['total_accounts']}
--- Errores encontrados: {self.stats['errors']}
-
--- Iniciar transacción
-BEGIN;
-
--- Insertar datos de cuentas
-""")
+            f.write(self._sql_header('accounts.sql', ACCOUNTS_DESCRIPTION, [
+                f"Total de cuentas: {self.stats['total_accounts']}",
+                f"Errores encontrados: {self.stats['errors']}",
+            ], 'account', 'Insertar datos de cuentas'))
             
             if self.accounts:
-                f.write("INSERT INTO account (account_id, customer_id, type, balance) VALUES\n")
-                
-                account_values = []
+                writer = BatchInsertWriter(f, 'account', self.ACCOUNT_COLUMNS, self.batch_size, self.dialect)
                 for account in self.accounts:
-                    value_line = f"    ({account['account_id']}, {account['customer_id']}, '{account['type']}', {account['balance']})"
-                    account_values.append(value_line)
-                
-                f.write(",\n".join(account_values))
-                f.write(";\n\n")
+                    writer.add(self._format_account_values(account))
+                writer.flush()
             else:
                 f.write("-- No hay datos de cuentas válidos para insertar\n\n")
             
-            f.write("""-- Confirmar transacción
-COMMIT;
-
--- Comentarios sobre la importación
-COMMENT ON TABLE account IS 'Tabla de cuentas importada desde CSV';
-""")
+            f.write(self._sql_footer('account', 'account_id', ACCOUNTS_COMMENT))
         
         self.logger.info(f"Archivo accounts.sql generado: {output_file}")
         return output_file
     
+    def stream_sql(self) -> Tuple[str, str]:
+        """
+        Genera customers.sql y accounts.sql en una sola pasada sobre el CSV
+        
+        Las filas validadas se escriben directamente en ambos archivos por
+        lotes, sin acumular clientes ni cuentas en memoria. Como los totales
+        no se conocen al inicio, el resumen se escribe al final de cada archivo.
+        
+        Returns:
+            Rutas de customers.sql y accounts.sql
+        """
+        customers_file = os.path.join(self.output_dir, 'customers.sql')
+        accounts_file = os.path.join(self.output_dir, 'accounts.sql')
+        self.logger.info(f"Iniciando procesamiento en streaming de {self.csv_file_path}")
+        
+        try:
+            with open(customers_file, 'w', encoding='utf-8') as customers_out, \
+                 open(accounts_file, 'w', encoding='utf-8') as accounts_out:
+                customers_out.write(self._sql_header('customers.sql', CUSTOMERS_DESCRIPTION, [],
+                                                     'customer', 'Insertar datos de clientes'))
+                accounts_out.write(self._sql_header('accounts.sql', ACCOUNTS_DESCRIPTION, [],
+                                                    'account', 'Insertar datos de cuentas'))
+                customer_writer = BatchInsertWriter(customers_out, 'customer',
+                                                    self.CUSTOMER_COLUMNS, self.batch_size, self.dialect)
+                account_writer = BatchInsertWriter(accounts_out, 'account',
+                                                   self.ACCOUNT_COLUMNS, self.batch_size, self.dialect)
+                
+                for customer_data, account_data in self._iter_valid_rows():
+                    if customer_data is not None:
+                        customer_writer.add(self._format_customer_values(customer_data))
+                    account_writer.add(self._format_account_values(account_data))
+                
+                customer_writer.flush()
+                account_writer.flush()
+                
+                customers_out.write(self._sql_footer('customer', 'customer_id', CUSTOMERS_COMMENT))
+                customers_out.write(f"""
+-- Total de clientes únicos: {self.stats['unique_customers']}
+-- Errores encontrados: {self.stats['errors']}
+""")
+                accounts_out.write(self._sql_footer('account', 'account_id', ACCOUNTS_COMMENT))
+                accounts_out.write(f"""
+-- Total de cuentas: {self.stats['total_accounts']}
+-- Errores encontrados: {self.stats['errors']}
+""")
+                
+        except FileNotFoundError:
+            raise CSVImportError(f"Archivo CSV no encontrado: {self.csv_file_path}")
+        except Exception as e:
+            raise CSVImportError(f"Error procesando CSV: {str(e)}")
+        
+        self.logger.info(f"Procesamiento completado. Estadísticas: {self.stats}")
+        self.logger.info(f"Archivo customers.sql generado: {customers_file}")
+        self.logger.info(f"Archivo accounts.sql generado: {accounts_file}")
+        return customers_file, accounts_file
+    
+    def copy_to_postgres(self, conn) -> Dict[str, int]:
+        """
+        Carga los clientes y cuentas validados en PostgreSQL usando COPY FROM STDIN
+        
+        Las filas se envían en streaming sin construir sentencias INSERT. Al usar
+        ids explícitos, las secuencias SERIAL se ajustan al máximo cargado.
+        
+        Args:
+            conn: Conexión psycopg2 abierta
+            
+        Returns:
+            Diccionario con el número de filas copiadas por tabla
+        """
+        from database_inserts.vendors.postgres import copy_rows, reset_serial
+        
+        cur = conn.cursor()
+        try:
+            self.logger.info("Copiando clientes con COPY customer FROM STDIN")
+            customers = copy_rows(
+                cur, 'customer', self.CUSTOMER_COLUMNS,
+                (tuple(customer[column] for column in self.CUSTOMER_COLUMNS)
+                 for customer in self.customers.values())
+            )
+            
+            self.logger.info("Copiando cuentas con COPY account FROM STDIN")
+            accounts = copy_rows(
+                cur, 'account', self.ACCOUNT_COLUMNS,
+                (tuple(account[column] for column in self.ACCOUNT_COLUMNS)
+                 for account in self.accounts)
+            )
+            
+            reset_serial(cur, 'customer', 'customer_id')
+            reset_serial(cur, 'account', 'account_id')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+        
+        self.logger.info(f"COPY completado: {customers} clientes, {accounts} cuentas")
+        return {'customer': customers, 'account': accounts}
+    
     def generate_error_report(self) -> str:
         """Genera un reporte de errores"""
         output_file = os.path.join(self.output_dir, 'import_errors.txt')
@@ -344,11 +624,12 @@ ESTADÍSTICAS:
 DETALLE DE ERRORES:
 """)
             
-            if self.errors:
+            if self.error_spool is not None and self.stats['errors']:
+                self.error_spool.seek(0)
+                shutil.copyfileobj(self.error_spool, f)
+            elif self.errors:
                 for error in self.errors:
-                    f.write(f"\nLínea {error['line']} - {error['type']}: {error['message']}\n")
-                    f.write(f"Datos: {error['data']}\n")
-                    f.write("-" * 80 + "\n")
+                    self._write_error_entry(f, error)
             else:
                 f.write("No se encontraron errores durante la importación.\n")
         
@@ -383,25 +664,182 @@ DETALLE DE ERRORES:
         except Exception as e:
             self.logger.error(f"Error durante la importación: {str(e)}")
             raise
+    
+    def run_stream(self) -> Dict[str, str]:
+        """
+        Ejecuta la importación en modo streaming (memoria acotada)
+        
+        Returns:
+            Diccionario con rutas de archivos generados
+        """
+        try:
+            with tempfile.TemporaryFile('w+', encoding='utf-8', dir=self.output_dir) as spool:
+                self.error_spool = spool
+                try:
+                    customers_file, accounts_file = self.stream_sql()
+                    errors_file = self.generate_error_report()
+                finally:
+                    self.error_spool = None
+            
+            self.logger.info("Importación completada exitosamente")
+            
+            return {
+                'customers_sql': customers_file,
+                'accounts_sql': accounts_file,
+                'error_report': errors_file,
+                'stats': self.stats
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error durante la importación: {str(e)}")
+            raise
+    
+    def run_copy(self, conn) -> Dict[str, str]:
+        """
+        Ejecuta la importación cargando los datos directamente con COPY
+        
+        Args:
+            conn: Conexión psycopg2 abierta
+            
+        Returns:
+            Diccionario con filas copiadas, reporte de errores y estadísticas
+        """
+        try:
+            self.process_csv()
+            
+            copied = self.copy_to_postgres(conn)
+            errors_file = self.generate_error_report()
+            
+            self.logger.info("Importación completada exitosamente")
+            
+            return {
+                'copied': copied,
+                'error_report': errors_file,
+                'stats': self.stats
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error durante la importación: {str(e)}")
+            raise
+
+
+def parse_arguments():
+    """Parsea los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description='Importa clientes y cuentas desde un CSV.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  uv run csv-import data.csv                # Genera customers.sql y accounts.sql
+  uv run csv-import data.csv --mode copy    # Carga directa en PostgreSQL con COPY
+  uv run csv-import big.csv --stream        # Una sola pasada con memoria acotada
+  uv run csv-import big.csv --stream --workers 8
+  uv run csv-import data.csv --dialect mssql  # SQL para SQL Server 2019
+        """
+    )
+    parser.add_argument('csv_file', help='Ruta al archivo CSV')
+    parser.add_argument(
+        '--mode', '-m',
+        choices=['sql', 'copy'],
+        default='sql',
+        help='sql: genera archivos SQL; copy: carga en PostgreSQL con COPY FROM STDIN (default: sql)',
+    )
+    parser.add_argument(
+        '--dialect', '-d',
+        choices=sorted(DIALECTS),
+        default='postgres',
+        help='Dialecto SQL de los archivos generados (default: postgres)',
+    )
+    parser.add_argument(
+        '--config', '-c',
+        default=None,
+        help='Configuración de conexión para --mode copy '
+             '(default: database_inserts/config-postgres.yaml)',
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Escribe el SQL mientras lee el CSV, con memoria acotada (solo --mode sql)',
+    )
+    parser.add_argument(
+        '--batch-size', '-b',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Máximo de filas por sentencia INSERT (default: {DEFAULT_BATCH_SIZE})',
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Procesos para validar el CSV en paralelo por rangos de bytes (default: 1)',
+    )
+    parser.add_argument(
+        '--index-dir',
+        default=None,
+        help='Directorio para respaldar los índices de deduplicación en archivos mmap '
+             '(por defecto se mantienen en memoria)',
+    )
+    parser.add_argument(
+        '--output-dir', '-o',
+        default='./output',
+        help='Directorio de salida para archivos SQL y reportes (default: ./output)',
+    )
+    return parser.parse_args()
+
+
+def run_copy_mode(importer: CSVImporter, config_file: Optional[str]) -> Dict:
+    """Conecta a PostgreSQL con la configuración de database_inserts y ejecuta COPY"""
+    from database_inserts.main import VENDOR_CONFIG, load_config
+    from database_inserts.vendors import postgres
+    
+    cfg = load_config(config_file or VENDOR_CONFIG['postgres']['config_file'], importer.logger)
+    conn = postgres.connect(cfg, importer.logger)
+    try:
+        return importer.run_copy(conn)
+    finally:
+        conn.close()
 
 
 def main():
     """Función principal"""
-    if len(sys.argv) != 2:
-        print("Uso: python csv_importer.py <ruta_archivo_csv>")
+    args = parse_arguments()
+    
+    if args.batch_size <= 0:
+        print("Error: --batch-size debe ser mayor a 0")
         sys.exit(1)
     
-    csv_file = sys.argv[1]
+    if args.workers <= 0:
+        print("Error: --workers debe ser mayor a 0")
+        sys.exit(1)
+    
+    if args.stream and args.mode != 'sql':
+        print("Error: --stream solo está disponible con --mode sql")
+        sys.exit(1)
+    
+    if args.mode == 'copy' and args.dialect != 'postgres':
+        print("Error: --mode copy solo está disponible con --dialect postgres")
+        sys.exit(1)
     
     try:
-        importer = CSVImporter(csv_file)
-        results = importer.run_import()
+        importer = CSVImporter(args.csv_file, args.output_dir, args.batch_size, args.index_dir,
+                               args.workers, args.dialect)
+        
+        if args.mode == 'copy':
+            results = run_copy_mode(importer, args.config)
+        elif args.stream:
+            results = importer.run_stream()
+        else:
+            results = importer.run_import()
         
         print("\n" + "="*60)
         print("IMPORTACIÓN COMPLETADA")
         print("="*60)
-        print(f"Archivo customers.sql: {results['customers_sql']}")
-        print(f"Archivo accounts.sql: {results['accounts_sql']}")
+        if args.mode == 'copy':
+            print(f"Clientes copiados: {results['copied']['customer']}")
+            print(f"Cuentas copiadas: {results['copied']['account']}")
+        else:
+            print(f"Archivo customers.sql: {results['customers_sql']}")
+            print(f"Archivo accounts.sql: {results['accounts_sql']}")
         print(f"Reporte de errores: {results['error_report']}")
         print(f"\nEstadísticas finales: {results['stats']}")
         
@@ -411,4 +849,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,163 @@
+"""
+Escritura incremental de sentencias INSERT multi-fila.
+Cada sentencia agrupa como máximo batch_size filas y se escribe en el archivo
+en cuanto se completa, de modo que nunca hay más de un lote en memoria.
+
+Los dialectos adaptan la sintaxis a cada vendor según tables/*.sql:
+- postgres: INSERT multi-fila dentro de BEGIN/COMMIT y setval de las secuencias.
+- mssql: INSERT multi-fila (máximo 1000 filas por VALUES) con IDENTITY_INSERT.
+- oracle: INSERT ALL ... SELECT 1 FROM DUAL (máximo 999 columnas en total por
+  sentencia) y reinicio de las columnas IDENTITY.
+"""
+from typing import Iterable, List, Optional, TextIO
+
+# Filas por sentencia INSERT (SQL Server admite como máximo 1000 por VALUES)
+DEFAULT_BATCH_SIZE = 1000
+
+
+class SQLDialect:
+    """Sintaxis SQL estándar; cada vendor sobrescribe lo que difiere"""
+    
+    name = 'standard'
+    # Máximo de filas por sentencia que admite el vendor (None = sin límite)
+    max_batch_size: Optional[int] = None
+    # Máximo de columnas (filas × columnas) por sentencia (None = sin límite)
+    max_batch_columns: Optional[int] = None
+    
+    def max_rows(self, column_count: int) -> Optional[int]:
+        """Máximo de filas por sentencia para una tabla de column_count columnas"""
+        limits = [self.max_batch_size]
+        if self.max_batch_columns is not None:
+            limits.append(self.max_batch_columns // column_count)
+        limits = [limit for limit in limits if limit is not None]
+        return min(limits) if limits else None
+    
+    def string(self, value: str) -> str:
+        """Formatea un texto como literal SQL escapando comillas simples"""
+        return "'" + value.replace("'", "''") + "'"
+    
+    def begin(self) -> str:
+        return "-- Iniciar transacción\nBEGIN;\n"
+    
+    def commit(self) -> str:
+        return "-- Confirmar transacción\nCOMMIT;\n"
+    
+    def before_inserts(self, table: str) -> str:
+        """Sentencias previas a insertar ids explícitos en la tabla"""
+        return ''
+    
+    def after_inserts(self, table: str) -> str:
+        """Sentencias posteriores a insertar ids explícitos en la tabla"""
+        return ''
+    
+    def insert(self, table: str, columns: List[str], rows: List[str]) -> str:
+        """Construye un INSERT multi-fila a partir de tuplas ya formateadas"""
+        values = ",\n".join(f"    {row}" for row in rows)
+        return f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n{values};\n\n"
+    
+    def sync_identity(self, table: str, id_column: str) -> str:
+        """Ajusta el generador de ids de la tabla tras cargar ids explícitos"""
+        return ''
+    
+    def table_comment(self, table: str, comment: str) -> str:
+        return f"COMMENT ON TABLE {table} IS {self.string(comment)};\n"
+
+
+class PostgresDialect(SQLDialect):
+    """PostgreSQL 12+: columnas SERIAL respaldadas por secuencias"""
+    
+    name = 'postgres'
+    
+    def sync_identity(self, table: str, id_column: str) -> str:
+        return (f"SELECT setval(pg_get_serial_sequence('{table}', '{id_column}'), "
+                f"(SELECT MAX({id_column}) FROM {table}));\n")
+
+
+class MSSQLDialect(SQLDialect):
+    """SQL Server 2019: columnas IDENTITY y textos NVARCHAR"""
+    
+    name = 'mssql'
+    max_batch_size = 1000
+    
+    def string(self, value: str) -> str:
+        return "N" + super().string(value)
+    
+    def begin(self) -> str:
+        return "-- Iniciar transacción\nBEGIN TRANSACTION;\n"
+    
+    def commit(self) -> str:
+        return "-- Confirmar transacción\nCOMMIT TRANSACTION;\nGO\n"
+    
+    def before_inserts(self, table: str) -> str:
+        return f"SET IDENTITY_INSERT {table} ON;\n\n"
+    
+    def after_inserts(self, table: str) -> str:
+        # Al insertar ids explícitos SQL Server avanza el valor IDENTITY solo
+        return f"SET IDENTITY_INSERT {table} OFF;\n\n"
+    
+    def table_comment(self, table: str, comment: str) -> str:
+        return (f"IF NOT EXISTS (SELECT 1 FROM sys.extended_properties "
+                f"WHERE major_id = OBJECT_ID('{table}') AND minor_id = 0 AND name = 'MS_Description')\n"
+                f"    EXEC sp_addextendedproperty 'MS_Description', {self.string(comment)}, "
+                f"'SCHEMA', 'dbo', 'TABLE', '{table}';\nGO\n")
+
+
+class OracleDialect(SQLDialect):
+    """Oracle 23ai: columnas GENERATED BY DEFAULT AS IDENTITY"""
+    
+    name = 'oracle'
+    max_batch_size = 1000
+    # INSERT ALL admite 999 columnas destino en total (ORA-24335)
+    max_batch_columns = 999
+    
+    def begin(self) -> str:
+        # Oracle inicia la transacción implícitamente con el primer DML
+        return ''
+    
+    def insert(self, table: str, columns: List[str], rows: List[str]) -> str:
+        column_list = ', '.join(columns)
+        targets = "\n".join(f"    INTO {table} ({column_list}) VALUES {row}" for row in rows)
+        return f"INSERT ALL\n{targets}\nSELECT 1 FROM DUAL;\n\n"
+    
+    def sync_identity(self, table: str, id_column: str) -> str:
+        return (f"ALTER TABLE {table} MODIFY {id_column} "
+                f"GENERATED BY DEFAULT AS IDENTITY (START WITH LIMIT VALUE);\n")
+
+
+DIALECTS = {
+    'postgres': PostgresDialect(),
+    'mssql': MSSQLDialect(),
+    'oracle': OracleDialect(),
+}
+
+
+class BatchInsertWriter:
+    """Agrupa filas ya formateadas en sentencias INSERT de tamaño acotado"""
+    
+    def __init__(self, file: TextIO, table: str, columns: Iterable[str],
+                 batch_size: int = DEFAULT_BATCH_SIZE, dialect: SQLDialect = DIALECTS['postgres']):
+        if batch_size <= 0:
+            raise ValueError(f"batch_size debe ser mayor a 0: {batch_size}")
+        self.file = file
+        self.table = table
+        self.columns = list(columns)
+        self.dialect = dialect
+        self.batch_size = min(batch_size, dialect.max_rows(len(self.columns)) or batch_size)
+        self.batch = []
+        self.rows_written = 0
+        self.statements_written = 0
+    
+    def add(self, values: str):
+        """Agrega una fila formateada como "(v1, v2, ...)" al lote actual"""
+        self.batch.append(values)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """Escribe el lote pendiente como una sentencia INSERT"""
+        if not self.batch:
+            return
+        self.file.write(self.dialect.insert(self.table, self.columns, self.batch))
+        self.rows_written += len(self.batch)
+        self.statements_written += 1
+        self.batch.clear()
@@ -0,0 +1,209 @@
+"""
+Generación de lotes de datos de prueba independiente del vendor.
+
+Cada lote referencia a sus padres por índice local (posición dentro del
+lote) en lugar de por id, de modo que puede generarse antes de conocer los
+ids que asignará la base de datos y enviarse después por cualquier vía.
+
+Las cardinalidades salen de un perfil de volumen (sección profile: de los
+config-*.yaml); cada cardinalidad es {min, max, distribution} donde
+distribution es uniform, o pareto (con alpha) para sesgarla hacia min con
+una cola larga hasta max.
+
+Las transacciones llevan timestamp dentro de una ventana histórica
+(timestamps: del perfil) con patrón diurno (horario bancario y picos de
+almuerzo y tarde) y estacional (fin de año, fines de semana), y se emiten
+ordenadas por timestamp dentro de cada cuenta para que la carga en tablas
+particionadas por fecha sea secuencial.
+"""
+import copy
+import random
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+ACCOUNT_TYPES = ['checking', 'savings']
+DISTRIBUTIONS = ('uniform', 'pareto')
+# Secciones del perfil que son cardinalidades {min, max, distribution}
+CARDINALITY_KEYS = ('accounts_per_customer', 'transactions_per_account', 'beneficiaries_per_customer')
+TRANSACTION_TYPES = ['deposit', 'withdrawal', 'transfer']
+
+# Perfil por defecto: mismas cardinalidades que el cargador original más
+# beneficiarios; sin cuentas heavy hitter
+DEFAULT_PROFILE = {
+    'accounts_per_customer': {'min': 1, 'max': 3, 'distribution': 'uniform'},
+    'transactions_per_account': {'min': 1, 'max': 10, 'distribution': 'uniform'},
+    'beneficiaries_per_customer': {'min': 0, 'max': 2, 'distribution': 'uniform'},
+    'heavy_hitters': {
+        'ratio': 0.0,
+        'transactions': {'min': 100000, 'max': 200000, 'distribution': 'uniform'},
+    },
+    'timestamps': {
+        'days': 365,        # largo de la ventana histórica
+        'end': None,        # fin de la ventana (YYYY-MM-DD, excluido); None = hoy
+        'diurnal': True,
+        'seasonal': True,
+    },
+}
+
+# Fin de la ventana de timestamps cuando hay semilla y el perfil no fija end:
+# con "hoy" la misma semilla generaría fechas distintas según el día
+SEEDED_TIMESTAMPS_END = date(2025, 1, 1)
+
+# Peso relativo de cada hora del día (0-23) y de cada mes y día de la
+# semana (lunes = 0) al muestrear timestamps
+DIURNAL_WEIGHTS = [1, 0.5, 0.3, 0.2, 0.2, 0.4, 1, 2.5, 4.5, 6, 7, 7.5,
+                   8.5, 8, 6.5, 6, 6.5, 7.5, 8, 7, 5.5, 4, 3, 2]
+MONTHLY_WEIGHTS = [0.85, 0.8, 0.95, 0.95, 1, 1, 1.05, 1, 0.95, 1, 1.1, 1.4]
+WEEKDAY_WEIGHTS = [1, 1, 1, 1, 1.15, 0.8, 0.55]
+
+# Días de la ventana de timestamps con sus pesos acumulados (para
+# random.choices) y los pesos acumulados de las horas del día
+Calendar = namedtuple('Calendar', ['days', 'day_weights', 'hour_weights'])
+
+# Lote generado; accounts/beneficiaries referencian clientes y transactions
+# referencian cuentas por índice local:
+# - customers: (name, address, contact, username, password)
+# - accounts: (índice del cliente, type, balance)
+# - transactions: (índice de la cuenta, type, amount, timestamp), ordenadas
+#   por timestamp dentro de cada cuenta
+# - beneficiaries: (índice del cliente, name, account_number, bank_details)
+Batch = namedtuple('Batch', ['customers', 'accounts', 'transactions', 'beneficiaries'])
+
+
+def build_profile(overrides=None):
+    """Combina DEFAULT_PROFILE con la sección profile: de un YAML (por clave)."""
+    profile = copy.deepcopy(DEFAULT_PROFILE)
+    for key, value in (overrides or {}).items():
+        if key not in profile:
+            raise ValueError(f"Clave de perfil desconocida: {key}")
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if isinstance(sub_value, dict) and isinstance(profile[key].get(sub_key), dict):
+                    profile[key][sub_key].update(sub_value)
+                else:
+                    profile[key][sub_key] = sub_value
+        else:
+            profile[key] = value
+    validate_profile(profile)
+    return profile
+
+
+def _cardinality_errors(name, spec):
+    """Problemas de una cardinalidad {min, max, distribution[, alpha]}."""
+    errors = []
+    low, high = spec.get('min'), spec.get('max')
+    if not isinstance(low, int) or isinstance(low, bool) or low < 0:
+        errors.append(f"{name}.min debe ser un entero >= 0: {low!r}")
+    elif not isinstance(high, int) or isinstance(high, bool) or high < low:
+        errors.append(f"{name}.max debe ser un entero >= min ({low}): {high!r}")
+    distribution = spec.get('distribution', 'uniform')
+    if distribution not in DISTRIBUTIONS:
+        errors.append(f"{name}.distribution desconocida: {distribution!r} "
+                      f"(opciones: {', '.join(DISTRIBUTIONS)})")
+    elif distribution == 'pareto':
+        alpha = spec.get('alpha', 1.5)
+        if not isinstance(alpha, (int, float)) or isinstance(alpha, bool) or alpha <= 0:
+            errors.append(f"{name}.alpha debe ser un número > 0: {alpha!r}")
+    return errors
+
+
+def validate_profile(profile):
+    """
+    Valida distribuciones y rangos del perfil al cargarlo, para no fallar a
+    mitad de la generación. Reúne todos los problemas en un solo ValueError.
+    """
+    errors = []
+    for key in CARDINALITY_KEYS:
+        errors.extend(_cardinality_errors(key, profile[key]))
+    heavy_hitters = profile['heavy_hitters']
+    ratio = heavy_hitters.get('ratio')
+    if not isinstance(ratio, (int, float)) or isinstance(ratio, bool) or not 0 <= ratio <= 1:
+        errors.append(f"heavy_hitters.ratio debe estar entre 0 y 1: {ratio!r}")
+    errors.extend(_cardinality_errors('heavy_hitters.transactions', heavy_hitters['transactions']))
+    timestamps = profile['timestamps']
+    days = timestamps.get('days')
+    if not isinstance(days, int) or isinstance(days, bool) or days < 1:
+        errors.append(f"timestamps.days debe ser un entero >= 1: {days!r}")
+    end = timestamps.get('end')
+    if isinstance(end, str):
+        try:
+            date.fromisoformat(end)
+        except ValueError:
+            errors.append(f"timestamps.end debe tener formato YYYY-MM-DD: {end!r}")
+    elif end is not None and not isinstance(end, date):
+        errors.append(f"timestamps.end debe tener formato YYYY-MM-DD: {end!r}")
+    if errors:
+        raise ValueError("Perfil inválido:\n  - " + "\n  - ".join(errors))
+
+
+def sample(spec):
+    """Muestrea una cardinalidad {min, max, distribution[, alpha]}."""
+    low, high = spec['min'], spec['max']
+    distribution = spec.get('distribution', 'uniform')
+    if distribution == 'uniform':
+        return random.randint(low, high)
+    if distribution == 'pareto':
+        return min(high, low - 1 + int(random.paretovariate(spec.get('alpha', 1.5))))
+    raise ValueError(f"Distribución desconocida: {distribution}")
+
+
+def build_calendar(spec):
+    """Construye el Calendar de la sección timestamps: de un perfil."""
+    if spec['days'] < 1:
+        raise ValueError(f"La ventana de timestamps debe tener al menos un día: {spec['days']}")
+    end = spec.get('end') or date.today()
+    if isinstance(end, str):
+        end = date.fromisoformat(end)
+    start = datetime(end.year, end.month, end.day) - timedelta(days=spec['days'])
+    days = [start + timedelta(days=offset) for offset in range(spec['days'])]
+    if spec.get('seasonal', True):
+        weights = [MONTHLY_WEIGHTS[day.month - 1] * WEEKDAY_WEIGHTS[day.weekday()] for day in days]
+    else:
+        weights = [1] * len(days)
+    hour_weights = DIURNAL_WEIGHTS if spec.get('diurnal', True) else [1] * 24
+    return Calendar(days, list(accumulate(weights)), list(accumulate(hour_weights)))
+
+
+def sample_timestamps(calendar, count):
+    """Muestrea count timestamps del calendario y los retorna ordenados."""
+    days = random.choices(calendar.days, cum_weights=calendar.day_weights, k=count)
+    hours = random.choices(range(24), cum_weights=calendar.hour_weights, k=count)
+    return sorted(
+        day + timedelta(hours=hour, seconds=random.randrange(3600))
+        for day, hour in zip(days, hours)
+    )
+
+
+def generate_batch(fake, first_customer, count, profile=DEFAULT_PROFILE):
+    """Genera count clientes con sus cuentas, transacciones y beneficiarios."""
+    customers = [
+        (fake.name(), fake.address(), fake.phone_number(),
+         f"{fake.user_name()}_{first_customer + i + 1}", fake.password())
+        for i in range(count)
+    ]
+    accounts = [
+        (customer_index, random.choice(ACCOUNT_TYPES), round(random.uniform(100, 10000), 2))
+        for customer_index in range(count)
+        for _ in range(sample(profile['accounts_per_customer']))
+    ]
+
+    heavy_hitters = profile['heavy_hitters']
+    calendar = build_calendar(profile['timestamps'])
+    transactions = []
+    for account_index in range(len(accounts)):
+        if heavy_hitters['ratio'] and random.random() < heavy_hitters['ratio']:
+            n_tx = sample(heavy_hitters['transactions'])
+        else:
+            n_tx = sample(profile['transactions_per_account'])
+        transactions.extend(
+            (account_index, random.choice(TRANSACTION_TYPES), round(random.uniform(10, 1000), 2), timestamp)
+            for timestamp in sample_timestamps(calendar, n_tx)
+        )
+
+    beneficiaries = [
+        (customer_index, fake.name(), fake.iban()[:30], f"{fake.company()} - {fake.swift()}"[:200])
+        for customer_index in range(count)
+        for _ in range(sample(profile['beneficiaries_per_customer']))
+    ]
+    return Batch(customers, accounts, transactions, beneficiaries)
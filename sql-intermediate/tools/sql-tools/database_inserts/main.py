@@ -2,22 +2,31 @@
 Script principal unificado para insertar datos de prueba en diferentes vendors (PostgreSQL, SQL Server, Oracle).
 Uso: uv run db-insert --vendor [postgres|mssql|oracle]
 """
+import os
 import sys
+import json
+import random
 import argparse
 from pathlib import Path
 
 import yaml
 from faker import Faker
 import time
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 
+from database_inserts.generator import SEEDED_TIMESTAMPS_END, build_profile
 from database_inserts.logger_config import (
     setup_logger, log_commit_start, log_commit_success,
     log_script_completion, log_script_error,
 )
-from database_inserts.vendors import postgres, mssql, oracle
+from database_inserts.vendors import base, postgres, mssql, oracle
 
 _PACKAGE_DIR = Path(__file__).parent
 
+# Clientes por lote; sus cuentas y transacciones se insertan en el mismo lote
+DEFAULT_BATCH_SIZE = 1000
+
 # ---------------------------------------------------------------------------
 # Mapeo de vendors
 # ---------------------------------------------------------------------------
@@ -52,6 +61,16 @@ Ejemplos de uso:
   uv run db-insert --vendor postgres
   uv run db-insert --vendor mssql
   uv run db-insert --vendor oracle
+  uv run db-insert --vendor postgres --customers 1000 --seed 42
+  uv run db-insert --vendor oracle --customers 100000 --batch-size 5000
+  uv run db-insert --vendor postgres --customers 100000 --ids reserve
+  uv run db-insert --vendor postgres --customers 1000000 --method copy --batch-size 10000
+  uv run db-insert --vendor postgres --customers 1000000 --workers 8
+  uv run db-insert --vendor postgres --customers 1000000 --commit-every 10000
+  uv run db-insert --vendor postgres --customers 1000000 --commit-every 10000 --resume
+  uv run db-insert --vendor postgres --customers 1000000 --engine async --connections 8
+  uv run db-insert --vendor mssql --customers 1000000 --engine pipeline --generators 4 --connections 4
+  uv run db-insert --vendor postgres --customers 100000 --profile profiles/heavy-hitters.yaml
         """
     )
     parser.add_argument(
@@ -67,6 +86,81 @@ Ejemplos de uso:
         default=10,
         help='Número de clientes a generar (default: 10)',
     )
+    parser.add_argument(
+        '--seed', '-s',
+        type=int,
+        default=None,
+        help='Semilla para generar exactamente los mismos datos en cada ejecución '
+             f'(si el perfil no fija timestamps.end, la ventana termina en {SEEDED_TIMESTAMPS_END})',
+    )
+    parser.add_argument(
+        '--batch-size', '-b',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Clientes por lote de inserción (default: {DEFAULT_BATCH_SIZE})',
+    )
+    parser.add_argument(
+        '--ids',
+        choices=['returning', 'reserve'],
+        default='returning',
+        help='returning: lee los ids generados con RETURNING/OUTPUT; '
+             'reserve: reserva rangos de ids en bloque antes de insertar (default: returning)',
+    )
+    parser.add_argument(
+        '--method', '-m',
+        choices=['insert', 'copy'],
+        default='insert',
+        help='insert: INSERT por lotes; copy: COPY FROM STDIN (solo postgres) (default: insert)',
+    )
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Procesos en paralelo, cada uno con su conexión y rango de clientes (default: 1)',
+    )
+    parser.add_argument(
+        '--commit-every',
+        type=int,
+        default=0,
+        help='Confirma cada N clientes (redondeado al lote) y registra el avance en el '
+             'checkpoint; 0 confirma una sola vez al final (default: 0)',
+    )
+    parser.add_argument(
+        '--checkpoint',
+        default='db-insert-checkpoint.json',
+        help='Archivo de checkpoint para --commit-every (default: db-insert-checkpoint.json)',
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Reanuda una carga interrumpida desde el último checkpoint',
+    )
+    parser.add_argument(
+        '--profile', '-p',
+        type=Path,
+        default=None,
+        help='YAML con la sección profile: de cardinalidades '
+             '(default: la sección profile: de config-<vendor>.yaml)',
+    )
+    parser.add_argument(
+        '--engine', '-e',
+        choices=['sync', 'async', 'pipeline'],
+        default='sync',
+        help='sync: inserción secuencial; async: asyncio + pipeline de psycopg 3 '
+             '(solo postgres); pipeline: procesos generadores + hilos escritores (default: sync)',
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=4,
+        help='Conexiones concurrentes de los motores async y pipeline (default: 4)',
+    )
+    parser.add_argument(
+        '--generators',
+        type=int,
+        default=2,
+        help='Procesos generadores del motor pipeline (default: 2)',
+    )
     return parser.parse_args()
 
 
@@ -85,11 +179,271 @@ def load_config(config_file: Path, logger):
         sys.exit(1)
 
 
+def load_profile(config_file: Path, logger):
+    """Lee la sección profile: del YAML y la combina con el perfil por defecto."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return build_profile((yaml.safe_load(f) or {}).get('profile'))
+    except FileNotFoundError:
+        logger.error(f"❌ Archivo de perfil no encontrado: {config_file}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"❌ Error al leer el perfil de volumen: {e}")
+        sys.exit(1)
+
+
+def log_profile(logger, profile):
+    """Muestra las cardinalidades del perfil de volumen."""
+    def describe(spec):
+        return f"{spec['min']}-{spec['max']} ({spec.get('distribution', 'uniform')})"
+
+    heavy_hitters = profile['heavy_hitters']
+    logger.info("📐 Perfil de volumen:")
+    logger.info(f"   Cuentas por cliente: {describe(profile['accounts_per_customer'])}")
+    logger.info(f"   Transacciones por cuenta: {describe(profile['transactions_per_account'])}")
+    logger.info(f"   Beneficiarios por cliente: {describe(profile['beneficiaries_per_customer'])}")
+    if heavy_hitters['ratio']:
+        logger.info(f"   Heavy hitters: {heavy_hitters['ratio']:.2%} de las cuentas con "
+                    f"{describe(heavy_hitters['transactions'])} transacciones")
+    timestamps = profile['timestamps']
+    patterns = [name for name, key in (('diurno', 'diurnal'), ('estacional', 'seasonal'))
+                if timestamps.get(key, True)]
+    logger.info(f"   Timestamps: {timestamps['days']} días hasta {timestamps.get('end') or 'hoy'}"
+                f" ({', '.join(patterns) or 'uniforme'})")
+
+
+def read_checkpoint(path):
+    """Lee un archivo de checkpoint; retorna None si no existe."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path, data):
+    """Escribe el checkpoint de forma atómica (archivo temporal + rename)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def create_faker(seed=None) -> Faker:
+    """Crea la instancia de Faker; con semilla también se inicializa random."""
+    fake = Faker()
+    if seed is not None:
+        fake.seed_instance(seed)
+        random.seed(seed)
+    return fake
+
+
+def plan_ranges(num_customers, workers):
+    """Divide los clientes en rangos disjuntos: lista de (desplazamiento, cantidad)."""
+    range_count = max(1, min(workers, num_customers))
+    per_range, remainder = divmod(num_customers, range_count)
+    ranges = []
+    offset = 0
+    for index in range(range_count):
+        size = per_range + (1 if index < remainder else 0)
+        ranges.append((offset, size))
+        offset += size
+    return ranges
+
+
+def load(vendor, conn, args, logger, num_customers, profile, seed=None, customer_offset=0,
+         index=0):
+    """
+    Inserta num_customers clientes (con sus cuentas, transacciones y
+    beneficiarios según el perfil) con el método elegido y confirma la transacción. Retorna las estadísticas.
+
+    Con --commit-every se confirma cada N clientes y se registra en
+    <checkpoint>.<index> cuántos clientes del rango quedaron confirmados;
+    con --resume la carga continúa a partir de ese punto.
+    """
+    start_time = time.time()
+    progress_file = f"{args.checkpoint}.{index}"
+    done = 0
+    if args.resume:
+        progress = read_checkpoint(progress_file)
+        if progress:
+            done = progress['completed']
+            logger.info(f"⏩ Reanudando desde el cliente {done}/{num_customers}")
+
+    committed = done
+
+    def commit_batch(completed):
+        nonlocal committed
+        completed += done
+        if completed - committed >= args.commit_every:
+            conn.commit()
+            write_checkpoint(progress_file, {
+                'customer_offset': customer_offset,
+                'customers': num_customers,
+                'completed': completed,
+            })
+            committed = completed
+            logger.info(f"💾 Commit hasta el cliente {completed}/{num_customers}")
+
+    on_batch = commit_batch if args.commit_every else None
+    writer = vendor.WRITERS[args.method](conn, reserve=args.ids == 'reserve')
+    try:
+        totals = base.insert(
+            writer, create_faker(seed), num_customers - done, logger, args.batch_size,
+            customer_offset=customer_offset + done, on_batch=on_batch, profile=profile)
+    finally:
+        writer.close()
+
+    log_commit_start(logger)
+    conn.commit()
+    log_commit_success(logger)
+    if args.commit_every:
+        write_checkpoint(progress_file, {
+            'customer_offset': customer_offset,
+            'customers': num_customers,
+            'completed': num_customers,
+        })
+    return {'customers': num_customers - done, **totals, 'seconds': time.time() - start_time}
+
+
+def _load_worker(task):
+    """Proceso worker: abre su propia conexión y carga su rango de clientes."""
+    index, vendor_name, cfg, args, profile, customer_offset, num_customers, seed = task
+    logger = setup_logger(f'{vendor_name}-w{index}', 'INFO')
+    vendor = VENDOR_CONFIG[vendor_name]['vendor']
+    conn = vendor.connect(cfg, logger)
+    try:
+        return load(vendor, conn, args, logger, num_customers, profile, seed, customer_offset, index)
+    finally:
+        conn.close()
+
+
+def load_parallel(vendor_name, cfg, args, logger, profile):
+    """Reparte los clientes entre args.workers procesos y retorna sus estadísticas."""
+    ranges = plan_ranges(args.customers, args.workers)
+    # Cada worker recibe siempre su propia semilla: sin --seed los procesos
+    # heredarían por fork el mismo estado aleatorio de Faker y generarían
+    # los mismos datos
+    seed_rng = random.Random(args.seed) if args.seed is not None else random.SystemRandom()
+    seeds = [seed_rng.randrange(2 ** 32) for _ in ranges]
+    tasks = [
+        (index, vendor_name, cfg, args, profile, customer_offset, num_customers, seed)
+        for index, ((customer_offset, num_customers), seed) in enumerate(zip(ranges, seeds))
+    ]
+
+    logger.info(f"⚙️  Cargando {args.customers} clientes en {len(tasks)} procesos...")
+    with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+        return list(executor.map(_load_worker, tasks))
+
+
+def load_async(cfg, args, logger, profile):
+    """Ejecuta el motor asyncio de PostgreSQL y retorna sus estadísticas."""
+    from database_inserts.vendors import postgres_async
+
+    start_time = time.time()
+    logger.info(f"⚡ Motor async: {args.connections} conexiones en modo pipeline")
+    totals = asyncio.run(postgres_async.insert(
+        cfg, create_faker(args.seed), args.customers, logger, args.batch_size, args.connections,
+        profile=profile))
+    return {'customers': args.customers, **totals, 'seconds': time.time() - start_time}
+
+
+def load_pipeline(vendor, cfg, args, logger, profile):
+    """Ejecuta el pipeline generadores → cola → escritores y retorna sus estadísticas."""
+    from database_inserts import pipeline
+
+    start_time = time.time()
+    totals = pipeline.run(
+        vendor, cfg, args.customers, logger, args.batch_size, args.generators,
+        args.connections, method=args.method, reserve=args.ids == 'reserve', seed=args.seed,
+        profile=profile)
+    return {'customers': args.customers, **totals, 'seconds': time.time() - start_time}
+
+
+def prepare_checkpoint(args, logger):
+    """
+    Registra el plan de carga (vendor, clientes, workers) en el checkpoint.
+    Al reanudar valida que coincida y reutiliza el mismo número de workers
+    para que los rangos de clientes sean idénticos a los de la ejecución original.
+    """
+    plan = {'vendor': args.vendor, 'customers': args.customers, 'workers': args.workers}
+    if args.resume:
+        saved = read_checkpoint(args.checkpoint)
+        if saved is None:
+            raise RuntimeError(f"No existe el checkpoint {args.checkpoint} para reanudar")
+        if (saved['vendor'], saved['customers']) != (args.vendor, args.customers):
+            raise RuntimeError(
+                f"El checkpoint corresponde a --vendor {saved['vendor']} "
+                f"--customers {saved['customers']}"
+            )
+        args.workers = saved['workers']
+        logger.info(f"⏩ Reanudando carga desde {args.checkpoint} ({args.workers} workers)")
+    else:
+        write_checkpoint(args.checkpoint, plan)
+        logger.info(f"📝 Checkpoint: {args.checkpoint} (commit cada {args.commit_every} clientes)")
+
+
+def remove_checkpoint(args):
+    """Elimina el plan y los avances por worker tras una carga completa."""
+    for index in range(args.workers):
+        if os.path.exists(f"{args.checkpoint}.{index}"):
+            os.remove(f"{args.checkpoint}.{index}")
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+
+def log_throughput(logger, results, elapsed):
+    """Muestra las filas insertadas y el throughput agregado de todos los workers."""
+    tables = ('customers', 'accounts', 'transactions', 'beneficiaries')
+    customers, accounts, transactions, beneficiaries = (
+        sum(r[table] for r in results) for table in tables)
+    rows = customers + accounts + transactions + beneficiaries
+    logger.info(f"📈 {rows} filas insertadas: {customers} clientes, {accounts} cuentas, "
+                f"{transactions} transacciones, {beneficiaries} beneficiarios")
+    for index, r in enumerate(results):
+        worker_rows = sum(r[table] for table in tables)
+        logger.info(f"   Worker {index}: {worker_rows} filas en {r['seconds']:.2f}s "
+                    f"({worker_rows / max(r['seconds'], 1e-9):,.0f} filas/s)")
+    logger.info(f"🚀 Throughput total: {rows / max(elapsed, 1e-9):,.0f} filas/s")
+
+
 # ---------------------------------------------------------------------------
 # Entrypoint
 # ---------------------------------------------------------------------------
 def main():
     args = parse_arguments()
+    if args.batch_size <= 0:
+        print("Error: --batch-size debe ser mayor a 0")
+        sys.exit(1)
+    if args.workers <= 0:
+        print("Error: --workers debe ser mayor a 0")
+        sys.exit(1)
+    if args.method not in VENDOR_CONFIG[args.vendor]['vendor'].WRITERS:
+        print(f"Error: --method {args.method} no está disponible con --vendor {args.vendor}")
+        sys.exit(1)
+    if args.commit_every < 0:
+        print("Error: --commit-every no puede ser negativo")
+        sys.exit(1)
+    if args.resume and not args.commit_every:
+        print("Error: --resume requiere --commit-every")
+        sys.exit(1)
+    if args.engine == 'async':
+        if args.vendor != 'postgres':
+            print("Error: --engine async solo está disponible con --vendor postgres")
+            sys.exit(1)
+        if args.method != 'insert' or args.ids != 'returning' or args.workers > 1 or args.commit_every:
+            print("Error: --engine async no admite --method copy, --ids reserve, --workers ni --commit-every")
+            sys.exit(1)
+    if args.engine == 'pipeline':
+        if args.workers > 1 or args.commit_every:
+            print("Error: --engine pipeline no admite --workers ni --commit-every")
+            sys.exit(1)
+        if args.generators <= 0:
+            print("Error: --generators debe ser mayor a 0")
+            sys.exit(1)
+    if args.connections <= 0:
+        print("Error: --connections debe ser mayor a 0")
+        sys.exit(1)
     vcfg = VENDOR_CONFIG[args.vendor]
 
     logger = setup_logger(args.vendor, 'INFO')
@@ -99,17 +453,41 @@ def main():
         logger.info(f"🚀 Iniciando inserción de datos para {vcfg['display_name']}")
 
         cfg = load_config(vcfg['config_file'], logger)
+        profile = load_profile(args.profile or vcfg['config_file'], logger)
+        if args.seed is not None and not profile['timestamps'].get('end'):
+            profile['timestamps']['end'] = SEEDED_TIMESTAMPS_END
+        log_profile(logger, profile)
         vendor = vcfg['vendor']
-        conn = vendor.connect(cfg, logger)
 
-        vendor.insert(conn, Faker(), args.customers, logger)
+        if args.seed is not None:
+            logger.info(f"🎲 Semilla: {args.seed}")
+        if args.method == 'copy':
+            logger.info(f"📦 Tamaño de lote: {args.batch_size} clientes | método: COPY")
+        else:
+            logger.info(f"📦 Tamaño de lote: {args.batch_size} clientes | ids: {args.ids}")
 
-        log_commit_start(logger)
-        conn.commit()
-        log_commit_success(logger)
-        conn.close()
+        if args.commit_every:
+            prepare_checkpoint(args, logger)
+
+        if args.engine == 'async':
+            results = [load_async(cfg, args, logger, profile)]
+        elif args.engine == 'pipeline':
+            results = [load_pipeline(vendor, cfg, args, logger, profile)]
+        elif args.workers > 1:
+            results = load_parallel(args.vendor, cfg, args, logger, profile)
+        else:
+            conn = vendor.connect(cfg, logger)
+            try:
+                results = [load(vendor, conn, args, logger, args.customers, profile, args.seed)]
+            finally:
+                conn.close()
+
+        if args.commit_every:
+            remove_checkpoint(args)
 
-        log_script_completion(logger, time.time() - start_time)
+        elapsed = time.time() - start_time
+        log_throughput(logger, results, elapsed)
+        log_script_completion(logger, elapsed)
 
     except Exception as e:
         log_script_error(logger, e)
@@ -0,0 +1,194 @@
+"""
+Pipeline productor/consumidor para db-insert.
+
+Procesos generadores producen lotes con Faker (CPU) y los dejan en una cola
+acotada; hilos escritores, cada uno con su propia conexión y BulkWriter, los
+drenan hacia la base de datos (red). La cola acotada aplica back-pressure: si los
+escritores no dan abasto los generadores se bloquean y viceversa.
+
+Al final se reporta el tiempo de cada etapa: generación, espera por cola
+llena (back-pressure), espera por cola vacía (escritores ociosos) y escritura.
+
+Si un generador o un escritor falla, el resto se detiene en cuanto termina su
+lote actual y la transacción de cada escritor se descarta.
+"""
+import queue
+import time
+import random
+import threading
+import multiprocessing
+
+from faker import Faker
+
+from database_inserts.generator import DEFAULT_PROFILE, generate_batch
+
+# Cada cuántos segundos se revisa si un generador murió sin reportar
+STATS_POLL_SECONDS = 1.0
+
+
+def plan_batches(num_customers, batch_size, customer_offset=0):
+    """Divide los clientes en lotes: lista de (índice, primer cliente, cantidad)."""
+    return [
+        (index, customer_offset + start, min(batch_size, num_customers - start))
+        for index, start in enumerate(range(0, num_customers, batch_size))
+    ]
+
+
+def _generate(batches, seed, process_seed, profile, batch_queue, stats_queue, stop):
+    """
+    Proceso generador: produce sus lotes en la cola compartida.
+    Con semilla cada lote se genera con seed + índice, así el contenido no
+    depende de qué proceso lo genere; sin ella el proceso usa process_seed,
+    distinta en cada generador para que no hereden el mismo estado aleatorio.
+    Siempre reporta sus tiempos (y el error, si lo hubo) en stats_queue.
+    """
+    stats = {'generate': 0.0, 'put_wait': 0.0, 'error': None}
+    try:
+        fake = Faker()
+        fake.seed_instance(process_seed)
+        random.seed(process_seed)
+        for index, first_customer, count in batches:
+            if stop.is_set():
+                break
+            started = time.perf_counter()
+            if seed is not None:
+                fake.seed_instance(seed + index)
+                random.seed(seed + index)
+            batch = generate_batch(fake, first_customer, count, profile)
+            generated = time.perf_counter()
+            batch_queue.put(batch)
+            stats['generate'] += generated - started
+            stats['put_wait'] += time.perf_counter() - generated
+    except Exception as e:
+        stats['error'] = f"{type(e).__name__}: {e}"
+    stats_queue.put(stats)
+
+
+def _collect_stats(producers, stats_queue, stop, totals):
+    """
+    Espera el reporte de cada generador. Ante el primer error (reportado,
+    proceso muerto sin reportar o falla de un escritor) detiene el resto.
+    Retorna (excepción del generador o None, reportes recibidos).
+    """
+    producer_stats = []
+    while len(producer_stats) < len(producers):
+        if totals['errors']:
+            stop.set()
+            return None, producer_stats
+        try:
+            stats = stats_queue.get(timeout=STATS_POLL_SECONDS)
+        except queue.Empty:
+            dead = [process for process in producers if process.exitcode not in (None, 0)]
+            if dead:
+                stop.set()
+                return (RuntimeError(f"Proceso generador terminó inesperadamente "
+                                     f"(código {dead[0].exitcode})"), producer_stats)
+            continue
+        producer_stats.append(stats)
+        if stats['error']:
+            stop.set()
+            return RuntimeError(f"Error en proceso generador: {stats['error']}"), producer_stats
+    return None, producer_stats
+
+
+def _write(writer, batch_queue, totals, lock, logger, num_customers):
+    """
+    Hilo escritor: inserta lotes hasta recibir None y confirma al final.
+    Si algún escritor falla, todos siguen drenando la cola sin escribir para
+    que los generadores no queden bloqueados, y la transacción se descarta.
+    """
+    get_wait_seconds = write_seconds = 0.0
+    while True:
+        started = time.perf_counter()
+        batch = batch_queue.get()
+        received = time.perf_counter()
+        get_wait_seconds += received - started
+        if batch is None:
+            break
+        if totals['errors']:
+            continue
+        try:
+            writer.write_batch(batch)
+        except Exception as e:
+            logger.error(f"❌ Error en escritor: {e}")
+            with lock:
+                totals['errors'].append(e)
+            continue
+        write_seconds += time.perf_counter() - received
+        with lock:
+            for table, rows in batch._asdict().items():
+                totals[table] += len(rows)
+            done = totals['customers']
+        logger.info(f"📦 Lote de {len(batch.customers)} clientes insertado ({done}/{num_customers})")
+    if totals['errors']:
+        writer.conn.rollback()
+    else:
+        writer.conn.commit()
+    with lock:
+        totals['get_wait'] += get_wait_seconds
+        totals['write'] += write_seconds
+
+
+def run(vendor, cfg, num_customers, logger, batch_size=1000, generators=2, writers=4,
+        method='insert', reserve=False, seed=None, profile=DEFAULT_PROFILE):
+    """
+    Ejecuta el pipeline y retorna las filas insertadas por tabla.
+    Los tiempos por etapa se suman sobre todos los procesos/hilos de la etapa.
+    """
+    batches = plan_batches(num_customers, batch_size)
+    generators = max(1, min(generators, len(batches)))
+    batch_queue = multiprocessing.Queue(maxsize=writers * 2)
+    stats_queue = multiprocessing.Queue()
+    totals = {'customers': 0, 'accounts': 0, 'transactions': 0, 'beneficiaries': 0,
+              'get_wait': 0.0, 'write': 0.0, 'errors': []}
+    lock = threading.Lock()
+    stop = multiprocessing.Event()
+    seed_rng = random.Random(seed) if seed is not None else random.SystemRandom()
+
+    bulk_writers = [vendor.WRITERS[method](vendor.connect(cfg, logger), reserve=reserve)
+                    for _ in range(writers)]
+    logger.info(f"🏭 Pipeline: {generators} procesos generadores → cola de "
+                f"{writers * 2} lotes → {writers} hilos escritores")
+    producers = [
+        multiprocessing.Process(target=_generate, args=(batches[index::generators], seed,
+                                                        seed_rng.randrange(2 ** 32), profile,
+                                                        batch_queue, stats_queue, stop))
+        for index in range(generators)
+    ]
+    threads = [
+        threading.Thread(target=_write, args=(writer, batch_queue, totals, lock, logger,
+                                              num_customers))
+        for writer in bulk_writers
+    ]
+    try:
+        for process in producers + threads:
+            process.start()
+        failure, producer_stats = _collect_stats(producers, stats_queue, stop, totals)
+        if failure is not None:
+            logger.error(f"❌ {failure}")
+            with lock:
+                totals['errors'].append(failure)
+        for process in producers:
+            process.join()
+        for _ in threads:
+            batch_queue.put(None)
+        for thread in threads:
+            thread.join()
+    finally:
+        for process in producers:
+            if process.is_alive():
+                process.terminate()
+        for writer in bulk_writers:
+            writer.close()
+            writer.conn.close()
+
+    if totals['errors']:
+        raise totals['errors'][0]
+
+    logger.info("⏱️  Tiempo por etapa (suma de procesos/hilos):")
+    logger.info(f"   Generación: {sum(s['generate'] for s in producer_stats):.2f}s")
+    logger.info(f"   Generadores bloqueados por cola llena: "
+                f"{sum(s['put_wait'] for s in producer_stats):.2f}s")
+    logger.info(f"   Escritores esperando lotes: {totals['get_wait']:.2f}s")
+    logger.info(f"   Escritura en base de datos: {totals['write']:.2f}s")
+    return {table: totals[table] for table in ('accounts', 'transactions', 'beneficiaries')}
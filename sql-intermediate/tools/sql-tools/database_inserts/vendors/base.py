@@ -0,0 +1,106 @@
+"""
+Interfaz común de escritura masiva para los vendors.
+
+Cada vendor implementa BulkWriter con su primitiva más rápida (execute_values,
+COPY, fast_executemany, array binding); la generación de datos y el recorrido
+cliente → cuenta → transacción viven una sola vez en este módulo.
+"""
+from abc import ABC, abstractmethod
+
+from database_inserts.generator import DEFAULT_PROFILE, generate_batch
+from database_inserts.logger_config import (
+    log_data_generation_start, log_customer_batch_complete, log_accounts_summary,
+)
+
+CUSTOMER_COLUMNS = ('name', 'address', 'contact', 'username', 'password')
+ACCOUNT_COLUMNS = ('customer_id', 'type', 'balance')
+TRANSACTION_COLUMNS = ('account_id', 'type', 'amount', 'timestamp')
+BENEFICIARY_COLUMNS = ('customer_id', 'name', 'account_number', 'bank_details')
+
+
+class BulkWriter(ABC):
+    """
+    Escritor masivo sobre una conexión. Las subclases implementan
+    write_customers/write_accounts (retornan los ids asignados, en el mismo
+    orden que las filas) y write_transactions/write_beneficiaries (retornan
+    cuántas filas escribieron).
+
+    Con reserve=True los ids se reservan en bloque antes de insertar en lugar
+    de leerlos con RETURNING/OUTPUT.
+    """
+
+    def __init__(self, conn, reserve=False):
+        self.conn = conn
+        self.reserve = reserve
+
+    @abstractmethod
+    def write_customers(self, rows):
+        """Inserta clientes y retorna sus ids en el orden de las filas"""
+        pass
+
+    @abstractmethod
+    def write_accounts(self, rows):
+        """Inserta cuentas y retorna sus ids en el orden de las filas"""
+        pass
+
+    @abstractmethod
+    def write_transactions(self, rows):
+        """Inserta transacciones y retorna cuántas filas escribió"""
+        pass
+
+    @abstractmethod
+    def write_beneficiaries(self, rows):
+        """Inserta beneficiarios y retorna cuántas filas escribió"""
+        pass
+
+    def write_batch(self, batch):
+        """
+        Escribe un lote de generator.generate_batch resolviendo los índices
+        locales de cuentas, transacciones y beneficiarios a los ids asignados
+        a sus padres, por lo que cada vendor debe retornar los ids en el orden
+        de las filas (las cardinalidades del perfil dependen de ello).
+        Las tablas sin filas en el lote (perfiles con mínimo 0) se omiten.
+        """
+        customer_ids = self.write_customers(batch.customers)
+        account_ids = []
+        if batch.accounts:
+            account_ids = self.write_accounts(
+                [(customer_ids[index], acc_type, balance) for index, acc_type, balance in batch.accounts])
+        if batch.beneficiaries:
+            self.write_beneficiaries(
+                [(customer_ids[index], *details) for index, *details in batch.beneficiaries])
+        if batch.transactions:
+            self.write_transactions(
+                [(account_ids[index], *details) for index, *details in batch.transactions])
+
+    def close(self):
+        pass
+
+
+def insert(writer, fake, num_customers, logger, batch_size=1000, customer_offset=0,
+           on_batch=None, profile=DEFAULT_PROFILE):
+    """
+    Genera e inserta num_customers clientes por lotes con el writer dado.
+    customer_offset desplaza el sufijo de los usernames (rangos de workers) y
+    on_batch(n), si se indica, se invoca tras cada lote con los clientes completados.
+    Retorna las filas insertadas por tabla.
+    """
+    totals = {'accounts': 0, 'transactions': 0, 'beneficiaries': 0}
+
+    log_data_generation_start(logger, num_customers)
+    logger.info("👥 Creando clientes, cuentas, transacciones y beneficiarios por lotes...")
+    for start in range(0, num_customers, batch_size):
+        count = min(batch_size, num_customers - start)
+        batch = generate_batch(fake, customer_offset + start, count, profile)
+        writer.write_batch(batch)
+        totals['accounts'] += len(batch.accounts)
+        totals['transactions'] += len(batch.transactions)
+        totals['beneficiaries'] += len(batch.beneficiaries)
+        logger.info(f"📦 Lote de {count} clientes insertado ({start + count}/{num_customers})")
+        if on_batch:
+            on_batch(start + count)
+
+    log_customer_batch_complete(logger, num_customers)
+    log_accounts_summary(logger, totals['accounts'], totals['transactions'])
+    logger.info(f"✅ {totals['beneficiaries']} beneficiarios creados")
+    return totals
@@ -1,9 +1,8 @@
-import random
-
 from database_inserts.logger_config import (
     log_connection_attempt, log_connection_success, log_connection_error,
-    log_data_generation_start, log_customer_progress, log_customer_batch_complete,
-    log_account_creation, log_transaction_batch, log_accounts_summary,
+)
+from database_inserts.vendors.base import (
+    BulkWriter, CUSTOMER_COLUMNS, ACCOUNT_COLUMNS, TRANSACTION_COLUMNS, BENEFICIARY_COLUMNS,
 )
 
 
@@ -25,47 +24,143 @@ def connect(cfg, logger):
         raise
 
 
-def insert(conn, fake, num_customers, logger):
-    cur = conn.cursor()
-    customer_ids = []
+# SQL Server admite como máximo 2100 parámetros por request, de los que uno
+# queda reservado: 2099 utilizables por sentencia
+MAX_PARAMETERS = 2099
 
-    log_data_generation_start(logger, num_customers)
-    logger.info("👥 Creando clientes...")
-    for i in range(num_customers):
-        name = fake.name()
-        log_customer_progress(logger, i + 1, num_customers, name)
-        cur.execute(
-            "INSERT INTO customer (name, address, contact, username, password) "
-            "OUTPUT INSERTED.customer_id VALUES (?, ?, ?, ?, ?)",
-            (name, fake.address(), fake.phone_number(), fake.user_name(), fake.password()),
-        )
-        customer_ids.append(cur.fetchone()[0])
-    log_customer_batch_complete(logger, num_customers)
-
-    total_accounts = total_transactions = 0
-    logger.info("🏦 Creando cuentas y transacciones...")
-    for cust_id in customer_ids:
-        for _ in range(random.randint(1, 3)):
-            acc_type = random.choice(['checking', 'savings'])
-            balance = round(random.uniform(100, 10000), 2)
-            cur.execute(
-                "INSERT INTO account (customer_id, type, balance) "
-                "OUTPUT INSERTED.account_id VALUES (?, ?, ?)",
-                (cust_id, acc_type, balance),
+
+# Tablas padre cuyos ids se reservan con --ids reserve: (tabla, columna id)
+RESERVED_TABLES = (('customer', 'customer_id'), ('account', 'account_id'))
+
+
+def sync_sequence(cur, table, column):
+    """
+    Crea la secuencia auxiliar <tabla>_<columna>_seq de reserve_ids a partir
+    de IDENT_CURRENT, o la reinicia en IDENT_CURRENT + 1 si IDENTITY la
+    superó: --ids returning toma ids de IDENTITY sin avanzar la secuencia.
+    Un applock de sesión serializa a los workers que sincronizan a la vez.
+    Debe ejecutarse fuera de una transacción, para que el DDL no bloquee la
+    secuencia hasta el commit de la carga.
+    """
+    sequence = f"{table}_{column}_seq"
+    cur.execute(f"""
+SET NOCOUNT ON;
+EXEC sys.sp_getapplock @Resource = N'{sequence}', @LockMode = 'Exclusive', @LockOwner = 'Session';
+BEGIN TRY
+    DECLARE @next BIGINT = COALESCE(CAST(IDENT_CURRENT(N'{table}') AS BIGINT), 0) + 1;
+    IF OBJECT_ID(N'{sequence}', N'SO') IS NULL
+        EXEC (N'CREATE SEQUENCE {sequence} AS BIGINT START WITH ' + CAST(@next AS NVARCHAR(20)));
+    ELSE IF (SELECT CAST(current_value AS BIGINT) FROM sys.sequences
+             WHERE object_id = OBJECT_ID(N'{sequence}')) < @next
+        EXEC (N'ALTER SEQUENCE {sequence} RESTART WITH ' + CAST(@next AS NVARCHAR(20)));
+END TRY
+BEGIN CATCH
+    EXEC sys.sp_releaseapplock @Resource = N'{sequence}', @LockOwner = 'Session';
+    THROW;
+END CATCH;
+EXEC sys.sp_releaseapplock @Resource = N'{sequence}', @LockOwner = 'Session';
+""")
+
+
+def reserve_ids(cur, table, column, count):
+    """
+    Reserva un rango de count ids con sp_sequence_get_range.
+    Las columnas IDENTITY no son secuencias, así que se usa la secuencia
+    auxiliar <tabla>_<columna>_seq, que sync_sequence deja por delante de
+    IDENTITY al crear el escritor.
+    """
+    cur.execute(f"""
+SET NOCOUNT ON;
+DECLARE @first SQL_VARIANT;
+EXEC sys.sp_sequence_get_range @sequence_name = N'{table}_{column}_seq', @range_size = ?,
+     @range_first_value = @first OUTPUT;
+SELECT CAST(@first AS BIGINT);
+""", count)
+    first = cur.fetchone()[0]
+    return list(range(first, first + count))
+
+
+class MSSQLBulkWriter(BulkWriter):
+    """
+    Padres con MERGE multi-fila + OUTPUT (fast_executemany no permite leer
+    OUTPUT), dividido según el límite de parámetros; con reserva los ids se
+    asignan con IDENTITY_INSERT y todo viaja con fast_executemany.
+
+    SQL Server no garantiza que OUTPUT retorne las filas en el orden de
+    VALUES, por eso cada fila lleva su posición (row_key) y MERGE, que a
+    diferencia de INSERT puede referenciar columnas del origen en OUTPUT,
+    la retorna junto al id asignado.
+    """
+
+    def __init__(self, conn, reserve=False):
+        super().__init__(conn, reserve)
+        self.cur = conn.cursor()
+        self.cur.fast_executemany = True
+        if reserve:
+            autocommit = conn.autocommit
+            conn.autocommit = True
+            try:
+                for table, column in RESERVED_TABLES:
+                    sync_sequence(self.cur, table, column)
+            finally:
+                conn.autocommit = autocommit
+
+    def _insert_parents(self, table, columns, id_column, rows):
+        if self.reserve:
+            ids = reserve_ids(self.cur, table, id_column, len(rows))
+            placeholders = ', '.join('?' * (len(columns) + 1))
+            self.cur.execute(f"SET IDENTITY_INSERT {table} ON")
+            self.cur.executemany(
+                f"INSERT INTO {table} ({id_column}, {', '.join(columns)}) VALUES ({placeholders})",
+                [(row_id, *row) for row_id, row in zip(ids, rows)],
+            )
+            self.cur.execute(f"SET IDENTITY_INSERT {table} OFF")
+            return ids
+
+        ids = [None] * len(rows)
+        rows_per_statement = MAX_PARAMETERS // len(columns)
+        placeholders = ', '.join('?' * len(columns))
+        column_list = ', '.join(columns)
+        source_list = ', '.join(f"s.{column}" for column in columns)
+        for start in range(0, len(rows), rows_per_statement):
+            chunk = rows[start:start + rows_per_statement]
+            values = ', '.join(f"({placeholders}, {start + offset})" for offset in range(len(chunk)))
+            self.cur.execute(
+                f"MERGE INTO {table} AS t "
+                f"USING (VALUES {values}) AS s ({column_list}, row_key) ON 1 = 0 "
+                f"WHEN NOT MATCHED THEN INSERT ({column_list}) VALUES ({source_list}) "
+                f"OUTPUT s.row_key, INSERTED.{id_column};",
+                [value for row in chunk for value in row],
             )
-            account_id = cur.fetchone()[0]
-            total_accounts += 1
-            log_account_creation(logger, cust_id, acc_type, balance)
-
-            n_tx = random.randint(1, 10)
-            for _ in range(n_tx):
-                cur.execute(
-                    "INSERT INTO transaction (account_id, type, amount) VALUES (?, ?, ?)",
-                    (account_id, random.choice(['deposit', 'withdrawal', 'transfer']),
-                     round(random.uniform(10, 1000), 2)),
-                )
-                total_transactions += 1
-            log_transaction_batch(logger, account_id, n_tx)
-
-    log_accounts_summary(logger, total_accounts, total_transactions)
-    cur.close()
+            for row_key, row_id in self.cur.fetchall():
+                ids[row_key] = row_id
+        return ids
+
+    def write_customers(self, rows):
+        return self._insert_parents('customer', CUSTOMER_COLUMNS, 'customer_id', rows)
+
+    def write_accounts(self, rows):
+        return self._insert_parents('account', ACCOUNT_COLUMNS, 'account_id', rows)
+
+    def write_transactions(self, rows):
+        self.cur.executemany(
+            f"INSERT INTO transaction ({', '.join(TRANSACTION_COLUMNS)}) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def write_beneficiaries(self, rows):
+        self.cur.executemany(
+            f"INSERT INTO beneficiary ({', '.join(BENEFICIARY_COLUMNS)}) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        return len(rows)
+
+    def close(self):
+        self.cur.close()
+
+
+# Escritores disponibles por --method
+WRITERS = {
+    'insert': MSSQLBulkWriter,
+}
@@ -1,9 +1,8 @@
-import random
-
 from database_inserts.logger_config import (
     log_connection_attempt, log_connection_success, log_connection_error,
-    log_data_generation_start, log_customer_progress, log_customer_batch_complete,
-    log_account_creation, log_transaction_batch, log_accounts_summary,
+)
+from database_inserts.vendors.base import (
+    BulkWriter, CUSTOMER_COLUMNS, ACCOUNT_COLUMNS, TRANSACTION_COLUMNS, BENEFICIARY_COLUMNS,
 )
 
 
@@ -21,50 +20,78 @@ def connect(cfg, logger):
         raise
 
 
-def insert(conn, fake, num_customers, logger):
-    import oracledb
-    cur = conn.cursor()
-    customer_ids = []
-
-    log_data_generation_start(logger, num_customers)
-    logger.info("👥 Creando clientes...")
-    for i in range(num_customers):
-        name = fake.name()
-        log_customer_progress(logger, i + 1, num_customers, name)
-        cid_var = cur.var(oracledb.NUMBER)
+def reserve_ids(conn, table, column, count):
+    """
+    Reserva count ids de la secuencia interna (ISEQ$$_n) de la columna
+    IDENTITY con un solo round-trip; la caché de la secuencia evita
+    contención entre sesiones.
+    """
+    with conn.cursor() as cur:
         cur.execute(
-            "INSERT INTO customer (name, address, contact, username, password) "
-            "VALUES (:1, :2, :3, :4, :5) RETURNING customer_id INTO :6",
-            (name, fake.address(), fake.phone_number(), fake.user_name(), fake.password(), cid_var),
+            "SELECT sequence_name FROM user_tab_identity_cols "
+            "WHERE table_name = :1 AND column_name = :2",
+            (table.upper(), column.upper()),
         )
-        customer_ids.append(cid_var.getvalue()[0])
-    log_customer_batch_complete(logger, num_customers)
+        sequence = cur.fetchone()[0]
+        cur.arraysize = count
+        cur.execute(f'SELECT "{sequence}".NEXTVAL FROM dual CONNECT BY LEVEL <= :1', (count,))
+        return [int(row[0]) for row in cur.fetchall()]
 
-    total_accounts = total_transactions = 0
-    logger.info("🏦 Creando cuentas y transacciones...")
-    for cust_id in customer_ids:
-        for _ in range(random.randint(1, 3)):
-            acc_type = random.choice(['checking', 'savings'])
-            balance = round(random.uniform(100, 10000), 2)
-            aid_var = cur.var(oracledb.NUMBER)
-            cur.execute(
-                "INSERT INTO account (customer_id, type, balance) "
-                "VALUES (:1, :2, :3) RETURNING account_id INTO :4",
-                (cust_id, acc_type, balance, aid_var),
-            )
-            account_id = aid_var.getvalue()[0]
-            total_accounts += 1
-            log_account_creation(logger, cust_id, acc_type, balance)
 
-            n_tx = random.randint(1, 10)
-            for _ in range(n_tx):
-                cur.execute(
-                    "INSERT INTO transaction (account_id, type, amount) VALUES (:1, :2, :3)",
-                    (account_id, random.choice(['deposit', 'withdrawal', 'transfer']),
-                     round(random.uniform(10, 1000), 2)),
+class OracleBulkWriter(BulkWriter):
+    """
+    executemany con array binding; los ids de los padres se leen con
+    RETURNING ... INTO sobre una variable de arreglo o se reservan en bloque.
+    Cada sentencia usa su propio cursor para no arrastrar setinputsizes.
+    """
+
+    def _insert_parents(self, table, columns, id_column, rows):
+        import oracledb
+        with self.conn.cursor() as cur:
+            if self.reserve:
+                ids = reserve_ids(self.conn, table, id_column, len(rows))
+                binds = ', '.join(f':{i}' for i in range(1, len(columns) + 2))
+                cur.executemany(
+                    f"INSERT INTO {table} ({id_column}, {', '.join(columns)}) VALUES ({binds})",
+                    [(row_id, *row) for row_id, row in zip(ids, rows)],
                 )
-                total_transactions += 1
-            log_transaction_batch(logger, account_id, n_tx)
+                return ids
+            binds = ', '.join(f':{i}' for i in range(1, len(columns) + 1))
+            id_var = cur.var(oracledb.NUMBER, arraysize=len(rows))
+            cur.setinputsizes(*([None] * len(columns)), id_var)
+            cur.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({binds}) "
+                f"RETURNING {id_column} INTO :{len(columns) + 1}",
+                rows,
+            )
+            return [int(id_var.getvalue(i)[0]) for i in range(len(rows))]
+
+    def write_customers(self, rows):
+        return self._insert_parents('customer', CUSTOMER_COLUMNS, 'customer_id', rows)
+
+    def write_accounts(self, rows):
+        return self._insert_parents('account', ACCOUNT_COLUMNS, 'account_id', rows)
+
+    def write_transactions(self, rows):
+        with self.conn.cursor() as cur:
+            cur.executemany(
+                f"INSERT INTO transaction ({', '.join(TRANSACTION_COLUMNS)}) "
+                f"VALUES (:1, :2, :3, :4)",
+                rows,
+            )
+        return len(rows)
+
+    def write_beneficiaries(self, rows):
+        with self.conn.cursor() as cur:
+            cur.executemany(
+                f"INSERT INTO beneficiary ({', '.join(BENEFICIARY_COLUMNS)}) "
+                f"VALUES (:1, :2, :3, :4)",
+                rows,
+            )
+        return len(rows)
+
 
-    log_accounts_summary(logger, total_accounts, total_transactions)
-    cur.close()
+# Escritores disponibles por --method
+WRITERS = {
+    'insert': OracleBulkWriter,
+}
@@ -1,9 +1,8 @@
-import random
-
 from database_inserts.logger_config import (
     log_connection_attempt, log_connection_success, log_connection_error,
-    log_data_generation_start, log_customer_progress, log_customer_batch_complete,
-    log_account_creation, log_transaction_batch, log_accounts_summary,
+)
+from database_inserts.vendors.base import (
+    BulkWriter, CUSTOMER_COLUMNS, ACCOUNT_COLUMNS, TRANSACTION_COLUMNS, BENEFICIARY_COLUMNS,
 )
 
 
@@ -22,47 +21,155 @@ def connect(cfg, logger):
         raise
 
 
-def insert(conn, fake, num_customers, logger):
-    cur = conn.cursor()
-    customer_ids = []
+def reserve_ids(cur, table, column, count):
+    """Reserva count ids de la secuencia SERIAL con un solo round-trip."""
+    cur.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+        (table, column, count),
+    )
+    return [row[0] for row in cur.fetchall()]
 
-    log_data_generation_start(logger, num_customers)
-    logger.info("👥 Creando clientes...")
-    for i in range(num_customers):
-        name = fake.name()
-        log_customer_progress(logger, i + 1, num_customers, name)
-        cur.execute(
-            "INSERT INTO customer (name, address, contact, username, password) "
-            "VALUES (%s, %s, %s, %s, %s) RETURNING customer_id",
-            (name, fake.address(), fake.phone_number(), fake.user_name(), fake.password()),
-        )
-        customer_ids.append(cur.fetchone()[0])
-    log_customer_batch_complete(logger, num_customers)
-
-    total_accounts = total_transactions = 0
-    logger.info("🏦 Creando cuentas y transacciones...")
-    for cust_id in customer_ids:
-        for _ in range(random.randint(1, 3)):
-            acc_type = random.choice(['checking', 'savings'])
-            balance = round(random.uniform(100, 10000), 2)
-            cur.execute(
-                "INSERT INTO account (customer_id, type, balance) "
-                "VALUES (%s, %s, %s) RETURNING account_id",
-                (cust_id, acc_type, balance),
+
+class PostgresBulkWriter(BulkWriter):
+    """INSERT multi-fila con execute_values; ids con RETURNING o reservados."""
+
+    def __init__(self, conn, reserve=False, page_size=1000):
+        super().__init__(conn, reserve)
+        self.cur = conn.cursor()
+        self.page_size = page_size
+
+    def _insert_parents(self, table, columns, id_column, rows):
+        from psycopg2.extras import execute_values
+        if self.reserve:
+            ids = reserve_ids(self.cur, table, id_column, len(rows))
+            execute_values(
+                self.cur,
+                f"INSERT INTO {table} ({id_column}, {', '.join(columns)}) VALUES %s",
+                [(row_id, *row) for row_id, row in zip(ids, rows)], page_size=self.page_size,
             )
-            account_id = cur.fetchone()[0]
-            total_accounts += 1
-            log_account_creation(logger, cust_id, acc_type, balance)
-
-            n_tx = random.randint(1, 10)
-            for _ in range(n_tx):
-                cur.execute(
-                    "INSERT INTO transaction (account_id, type, amount) VALUES (%s, %s, %s)",
-                    (account_id, random.choice(['deposit', 'withdrawal', 'transfer']),
-                     round(random.uniform(10, 1000), 2)),
-                )
-                total_transactions += 1
-            log_transaction_batch(logger, account_id, n_tx)
-
-    log_accounts_summary(logger, total_accounts, total_transactions)
-    cur.close()
+            return ids
+        return [row[0] for row in execute_values(
+            self.cur,
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s RETURNING {id_column}",
+            rows, page_size=self.page_size, fetch=True,
+        )]
+
+    def write_customers(self, rows):
+        return self._insert_parents('customer', CUSTOMER_COLUMNS, 'customer_id', rows)
+
+    def write_accounts(self, rows):
+        return self._insert_parents('account', ACCOUNT_COLUMNS, 'account_id', rows)
+
+    def write_transactions(self, rows):
+        from psycopg2.extras import execute_values
+        execute_values(
+            self.cur,
+            f"INSERT INTO transaction ({', '.join(TRANSACTION_COLUMNS)}) VALUES %s",
+            rows, page_size=self.page_size,
+        )
+        return len(rows)
+
+    def write_beneficiaries(self, rows):
+        from psycopg2.extras import execute_values
+        execute_values(
+            self.cur,
+            f"INSERT INTO beneficiary ({', '.join(BENEFICIARY_COLUMNS)}) VALUES %s",
+            rows, page_size=self.page_size,
+        )
+        return len(rows)
+
+    def close(self):
+        self.cur.close()
+
+
+# ---------------------------------------------------------------------------
+# COPY FROM STDIN
+# ---------------------------------------------------------------------------
+def copy_value(value):
+    """Formatea un valor en el formato de texto de COPY (tabuladores y \\N)."""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class CopyStream:
+    """
+    Objeto tipo archivo que alimenta COPY FROM STDIN desde un iterable de filas.
+    Solo mantiene en memoria el bloque que psycopg2 solicita en cada read().
+    """
+
+    def __init__(self, rows):
+        self._lines = ('\t'.join(copy_value(v) for v in row) + '\n' for row in rows)
+        self._buffer = ''
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for line in self._lines:
+            chunks.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = ''.join(chunks)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def copy_rows(cur, table, columns, rows):
+    """Carga las filas en la tabla con COPY FROM STDIN y retorna cuántas se copiaron."""
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN",
+        CopyStream(rows),
+    )
+    return cur.rowcount
+
+
+def reset_serial(cur, table, column):
+    """Ajusta la secuencia SERIAL al máximo id tras cargar ids explícitos."""
+    cur.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, %s), MAX({column})) FROM {table}",
+        (table, column),
+    )
+
+
+class PostgresCopyWriter(BulkWriter):
+    """
+    COPY FROM STDIN por tabla. Los ids de los padres siempre se reservan con
+    nextval en bloque, ya que COPY no puede retornar los ids generados.
+    """
+
+    def __init__(self, conn, reserve=True):
+        super().__init__(conn, reserve=True)
+        self.cur = conn.cursor()
+
+    def _copy_parents(self, table, columns, id_column, rows):
+        ids = reserve_ids(self.cur, table, id_column, len(rows))
+        copy_rows(self.cur, table, (id_column, *columns),
+                  ((row_id, *row) for row_id, row in zip(ids, rows)))
+        return ids
+
+    def write_customers(self, rows):
+        return self._copy_parents('customer', CUSTOMER_COLUMNS, 'customer_id', rows)
+
+    def write_accounts(self, rows):
+        return self._copy_parents('account', ACCOUNT_COLUMNS, 'account_id', rows)
+
+    def write_transactions(self, rows):
+        return copy_rows(self.cur, 'transaction', TRANSACTION_COLUMNS, rows)
+
+    def write_beneficiaries(self, rows):
+        return copy_rows(self.cur, 'beneficiary', BENEFICIARY_COLUMNS, rows)
+
+    def close(self):
+        self.cur.close()
+
+
+# Escritores disponibles por --method
+WRITERS = {
+    'insert': PostgresBulkWriter,
+    'copy': PostgresCopyWriter,
+}
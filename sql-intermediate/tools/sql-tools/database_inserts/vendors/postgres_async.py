@@ -0,0 +1,126 @@
+"""
+Motor asíncrono para PostgreSQL con psycopg 3 (asyncio + pipeline mode).
+
+Un productor genera lotes con Faker y los deja en una cola acotada; varios
+consumidores, cada uno con su propia conexión, envían los lotes en modo
+pipeline. Mientras la base de datos procesa un lote el event loop sigue
+generando el siguiente, solapando generación y red.
+"""
+import asyncio
+
+from database_inserts.generator import DEFAULT_PROFILE, generate_batch
+from database_inserts.logger_config import (
+    log_connection_attempt, log_connection_success, log_connection_error,
+    log_data_generation_start, log_customer_batch_complete, log_accounts_summary,
+)
+
+
+async def connect(cfg, logger):
+    import psycopg
+    log_connection_attempt(logger, "PostgreSQL (async)", cfg['host'], cfg['database'], cfg['user'])
+    try:
+        conn = await psycopg.AsyncConnection.connect(
+            host=cfg['host'], port=cfg['port'],
+            dbname=cfg['database'], user=cfg['user'], password=cfg['password'],
+        )
+        log_connection_success(logger, "PostgreSQL (async)")
+        return conn
+    except Exception as e:
+        log_connection_error(logger, "PostgreSQL (async)", e)
+        raise
+
+
+def columns(rows, width):
+    """Transpone filas a width listas por columna para enviarlas como arreglos."""
+    return [list(column) for column in zip(*rows)] or [[] for _ in range(width)]
+
+
+async def write_batch(conn, batch):
+    """
+    Inserta un lote con un INSERT ... SELECT FROM unnest(...) por tabla,
+    resolviendo los índices locales a ids. Como en BulkWriter, los ids de
+    clientes y cuentas deben quedar en el orden de las filas: los padres se
+    insertan en orden de WITH ORDINALITY, así el serial les asigna ids
+    crecientes en ese orden, y se ordenan los ids retornados (RETURNING no
+    garantiza orden).
+    """
+    async with conn.pipeline(), conn.cursor() as cur:
+        await cur.execute(
+            "INSERT INTO customer (name, address, contact, username, password) "
+            "SELECT name, address, contact, username, password "
+            "FROM unnest(%s::varchar[], %s::varchar[], %s::varchar[], %s::varchar[], %s::varchar[]) "
+            "WITH ORDINALITY AS u(name, address, contact, username, password, position) "
+            "ORDER BY position RETURNING customer_id",
+            columns(batch.customers, 5),
+        )
+        customer_ids = sorted(row[0] for row in await cur.fetchall())
+
+        await cur.execute(
+            "INSERT INTO account (customer_id, type, balance) "
+            "SELECT customer_id, type, balance "
+            "FROM unnest(%s::int[], %s::varchar[], %s::numeric[]) "
+            "WITH ORDINALITY AS u(customer_id, type, balance, position) "
+            "ORDER BY position RETURNING account_id",
+            columns([(customer_ids[index], acc_type, balance)
+                     for index, acc_type, balance in batch.accounts], 3),
+        )
+        account_ids = sorted(row[0] for row in await cur.fetchall())
+
+        await cur.execute(
+            "INSERT INTO beneficiary (customer_id, name, account_number, bank_details) "
+            "SELECT * FROM unnest(%s::int[], %s::varchar[], %s::varchar[], %s::varchar[])",
+            columns([(customer_ids[index], *details) for index, *details in batch.beneficiaries], 4),
+        )
+
+        await cur.execute(
+            "INSERT INTO transaction (account_id, type, amount, timestamp) "
+            "SELECT * FROM unnest(%s::int[], %s::transaction_type[], %s::numeric[], %s::timestamp[])",
+            columns([(account_ids[index], *details) for index, *details in batch.transactions], 4),
+        )
+
+
+async def insert(cfg, fake, num_customers, logger, batch_size=1000, connections=4,
+                 customer_offset=0, profile=DEFAULT_PROFILE):
+    """
+    Inserta los datos con connections conexiones concurrentes y confirma
+    cada conexión al terminar. Retorna las filas insertadas por tabla.
+    Si un consumidor falla, el TaskGroup cancela al productor y al resto.
+    """
+    conns = [await connect(cfg, logger) for _ in range(connections)]
+    queue = asyncio.Queue(maxsize=connections * 2)
+    totals = {'customers': 0, 'accounts': 0, 'transactions': 0, 'beneficiaries': 0}
+
+    async def produce():
+        # La generación es CPU pura: se ejecuta en un hilo aparte para que el
+        # event loop siga atendiendo la I/O de los consumidores mientras tanto
+        for start in range(0, num_customers, batch_size):
+            count = min(batch_size, num_customers - start)
+            batch = await asyncio.to_thread(generate_batch, fake, customer_offset + start, count, profile)
+            await queue.put(batch)
+        for _ in conns:
+            await queue.put(None)
+
+    async def consume(conn):
+        while (batch := await queue.get()) is not None:
+            await write_batch(conn, batch)
+            for table, rows in batch._asdict().items():
+                totals[table] += len(rows)
+            logger.info(f"📦 Lote de {len(batch.customers)} clientes insertado "
+                        f"({totals['customers']}/{num_customers})")
+        await conn.commit()
+
+    log_data_generation_start(logger, num_customers)
+    logger.info(f"👥 Insertando lotes en pipeline con {connections} conexiones...")
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for conn in conns:
+                tg.create_task(consume(conn))
+            tg.create_task(produce())
+    finally:
+        for conn in conns:
+            await conn.close()
+
+    log_customer_batch_complete(logger, num_customers)
+    log_accounts_summary(logger, totals['accounts'], totals['transactions'])
+    logger.info(f"✅ {totals['beneficiaries']} beneficiarios creados")
+    return {table: totals[table] for table in ('accounts', 'transactions', 'beneficiaries')}